@@ -1,9 +1,9 @@
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from database import users_collection
+from auth.user_cache import USER_CACHE
+from auth.hash_pool import HASH_POOL
 import os
 
 # ----------------------------
@@ -13,23 +13,22 @@ SECRET_KEY = os.getenv("SECRET_KEY", "college_scraper_super_secret_2026")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-# ✅ ARGON2 (MATCHES DB)
-pwd_context = CryptContext(
-    schemes=["argon2"],
-    deprecated="auto"
-)
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 # ----------------------------
 # PASSWORD UTILS
 # ----------------------------
+# Both run on HASH_POOL and raise HashPoolBusy when it is saturated
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return HASH_POOL.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return HASH_POOL.verify(plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await HASH_POOL.verify_async(plain_password, hashed_password)
 
 
 # ----------------------------
@@ -62,7 +61,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
 
-    user = users_collection.find_one({"username": username})
+    user = USER_CACHE.get(username)
     if user is None:
         raise credentials_exception
 
@@ -0,0 +1,63 @@
+import asyncio
+import os
+from concurrent.futures import Future
+from threading import BoundedSemaphore
+
+from passlib.context import CryptContext
+
+from process_pool import SpawnPool
+
+# ✅ ARGON2 (MATCHES DB)
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto"
+)
+
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hash/verify calls running or waiting, beyond this callers get HashPoolBusy
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", str(HASH_WORKERS * 4)))
+
+
+class HashPoolBusy(Exception):
+    """Too many hash/verify calls queued, the caller should answer 429"""
+
+
+# Run in the pool processes
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class HashPool(SpawnPool):
+    """Size-limited process pool for argon2 work, extra submissions fail fast"""
+
+    def __init__(self, workers: int = HASH_WORKERS, queue_limit: int = HASH_QUEUE_LIMIT):
+        super().__init__(workers)
+        self._slots = BoundedSemaphore(queue_limit)
+
+    def submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise HashPoolBusy()
+        try:
+            future = super().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def hash(self, password: str) -> str:
+        return self.submit(_hash, password).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self.submit(_verify, plain_password, hashed_password).result()
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Awaitable verify, holds no thread while the hash runs"""
+        return await asyncio.wrap_future(self.submit(_verify, plain_password, hashed_password))
+
+
+HASH_POOL = HashPool()
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, HTTPException, Form, Body
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 from database import users_collection
-from auth.auth_utils import verify_password, create_access_token
+from auth.auth_utils import verify_password_async, create_access_token
+from auth.hash_pool import HashPoolBusy
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/login")
-def login(
+async def login(
     username: Optional[str] = Form(None),
     password: Optional[str] = Form(None),
     body: Optional[dict] = Body(None),
@@ -20,9 +22,19 @@ def login(
     if not username or not password:
         raise HTTPException(status_code=422, detail="Username and password required")
 
-    user = users_collection.find_one({"username": username})
+    user = await run_in_threadpool(users_collection.find_one, {"username": username})
 
-    if not user or not verify_password(password, user["password"]):
+    # argon2 runs on the hash process pool, no shared threadpool thread is held
+    try:
+        valid = bool(user) and await verify_password_async(password, user["password"])
+    except HashPoolBusy:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many login attempts, try again shortly",
+            headers={"Retry-After": "1"}
+        )
+
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     access_token = create_access_token(data={"sub": username})
@@ -0,0 +1,97 @@
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from database import users_collection, meta_collection
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
+# How often the shared version stamp is re-read from Mongo
+VERSION_CHECK_INTERVAL = 5
+
+VERSION_ID = "users_cache_version"
+
+
+class UserCache:
+    """Bounded LRU + TTL cache of user records keyed by username"""
+
+    def __init__(self, size: int = USER_CACHE_SIZE, ttl: int = USER_CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self._version = None
+        self._version_checked_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self._miss_seconds = 0.0
+
+    # ---- version stamp ----
+    def _read_version(self) -> int:
+        doc = meta_collection.find_one({"_id": VERSION_ID})
+        return doc["version"] if doc else 0
+
+    def _check_version(self):
+        now = time.monotonic()
+        if now - self._version_checked_at < VERSION_CHECK_INTERVAL:
+            return
+        self._version_checked_at = now
+
+        version = self._read_version()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+
+    # ---- lookups ----
+    def get(self, username: str) -> dict | None:
+        self._check_version()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry and now - entry[0] < self.ttl:
+                self._entries.move_to_end(username)
+                self.hits += 1
+                return entry[1]
+
+        start = time.perf_counter()
+        user = users_collection.find_one({"username": username})
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.misses += 1
+            self._miss_seconds += elapsed
+            # Unknown users are not cached, a new account works immediately
+            if user is not None:
+                self._entries[username] = (now, user)
+                self._entries.move_to_end(username)
+                while len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+
+        return user
+
+    def invalidate(self, username: str):
+        with self._lock:
+            self._entries.pop(username, None)
+
+        meta_collection.update_one({"_id": VERSION_ID}, {"$inc": {"version": 1}}, upsert=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            avg_miss_ms = self._miss_seconds / self.misses * 1000 if self.misses else 0.0
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "avg_miss_ms": round(avg_miss_ms, 2),
+                # Each hit skipped roughly one DB lookup
+                "saved_ms_estimate": round(self.hits * avg_miss_ms, 1),
+            }
+
+
+USER_CACHE = UserCache()
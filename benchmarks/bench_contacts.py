@@ -0,0 +1,94 @@
+"""Contact extraction cost: the old per-pipeline scans vs one ContactExtractor pass.
+
+    pip install -r benchmarks/requirements.txt  # BeautifulSoup, for the old path
+    python -m benchmarks.bench_contacts --pages 300 --filler-kb 40
+"""
+import argparse
+import random
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from scraper.contact_utils import CONTACT_EXTRACTOR, clean_phone, is_valid_email, is_valid_phone, score_email
+
+PAGE_TEMPLATE = """<html><head><title>{name}</title>
+<script>var tracking = "UA-{n:08d}"; var ts = 1697{n:06d};</script></head>
+<body><nav><a href="/about">About</a> <a href="/admissions">Admissions</a></nav>
+<h1>{name}</h1>
+<p>{filler}</p>
+<p>Established 14072005. Approved by AICTE, ref {n:012d}.</p>
+<p>Write to <a href="mailto:{email}">{email}</a> or principal.{n}@gmail.com</p>
+<img src="logo@2x.png"> <a href="mailto:noreply@college{n}.ac.in">noreply</a>
+<footer>Office: <a href="tel:{landline}">{landline}</a> Mobile: {mobile}</footer>
+</body></html>"""
+
+LOREM = "Lorem ipsum dolor sit amet, consectetur adipiscing elit 2024. "
+
+
+def fixture_page(n: int, filler_kb: int, rng: random.Random) -> str:
+    filler = LOREM * (filler_kb * 1024 // len(LOREM))
+    email = rng.choice([f"info@college{n}.ac.in", f"office@gcoe{n}.edu.in", f"admissions{n}@yahoo.com"])
+    landline = f"0{rng.randint(20, 99)}{rng.randint(2, 9)}-{rng.randint(100000, 999999)}"
+    mobile = rng.choice([f"+91 9{n:09d}", f"9{n:09d}", f"+91-8{n:09d}"])
+    return PAGE_TEMPLATE.format(name=f"Government College of Engineering {n}", n=n,
+                                filler=filler, email=email, landline=landline, mobile=mobile)
+
+
+# ---- the pre-ContactExtractor implementations, kept here as the baseline ----
+OLD_PHONE_PATTERN = re.compile(r'\+?91[-.\s]?\d{10}|\d{10}')
+OLD_EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+
+def old_extractor(html: str) -> tuple:
+    emails = OLD_EMAIL_PATTERN.findall(html[:50000])
+    scored = [(score_email(e), e) for e in set(emails) if is_valid_email(e)]
+    email = "Not Mentioned"
+    if scored and max(s[0] for s in scored) >= 5:
+        email = sorted(scored, reverse=True)[0][1]
+
+    phone = "Not Mentioned"
+    for p in OLD_PHONE_PATTERN.findall(html[:50000]):
+        if clean_phone(p):
+            phone = clean_phone(p)
+            break
+    return email, phone
+
+
+def old_scraper(html: str) -> tuple:
+    emails = list(set(re.findall(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", html)))
+    text = BeautifulSoup(html, "html.parser").get_text(" ")
+    candidates = re.findall(r"\+91[\s\-]?\d{10}|0\d{2,4}[\s\-]?\d{6,8}|\d{10}", text)
+    phones = list({re.sub(r"\D", "", c) for c in candidates if is_valid_phone(c)})
+    return emails, phones
+
+
+def timed(fn, pages) -> tuple:
+    start = time.perf_counter()
+    results = [fn(page) for page in pages]
+    return time.perf_counter() - start, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--filler-kb", type=int, default=40)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    pages = [fixture_page(n, args.filler_kb, rng) for n in range(args.pages)]
+    mb = sum(len(p) for p in pages) / 1e6
+
+    extractor_s, old_best = timed(old_extractor, pages)
+    scraper_s, _ = timed(old_scraper, pages)
+    new_s, contacts = timed(lambda page: CONTACT_EXTRACTOR.extract(page[:50000]), pages)
+    new_full_s, _ = timed(CONTACT_EXTRACTOR.extract, pages)
+
+    agree = sum(old == (c.best_email(), c.best_phone()) for old, c in zip(old_best, contacts))
+
+    print(f"{args.pages} pages, {mb:.1f} MB")
+    print(f"  old extractor (2 regex scans, 50k chars): {extractor_s / args.pages * 1e6:9.1f} us/page")
+    print(f"  old scraper (regex + BeautifulSoup):      {scraper_s / args.pages * 1e6:9.1f} us/page")
+    print(f"  ContactExtractor (50k chars):             {new_s / args.pages * 1e6:9.1f} us/page")
+    print(f"  ContactExtractor (whole page):            {new_full_s / args.pages * 1e6:9.1f} us/page")
+    print(f"  best email/phone agree with old extractor: {agree}/{args.pages}")
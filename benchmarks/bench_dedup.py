@@ -0,0 +1,84 @@
+"""Duplicate check cost: old linear scans vs DedupIndex, as the index grows.
+
+    python -m benchmarks.bench_dedup --sizes 500 2000 8000
+"""
+import argparse
+import random
+import string
+import time
+
+from extractor.dedup_utils import DedupIndex, normalize_name
+
+WORDS = ["government", "shri", "sant", "gajanan", "maharaj", "engineering", "technology",
+         "rajarambapu", "walchand", "sinhgad", "vidya", "pratishthan", "dr", "babasaheb",
+         "ambedkar", "marathwada", "mitra", "mandal", "shikshan", "prasarak", "sanstha"]
+
+
+def random_college(rng: random.Random) -> tuple:
+    words = rng.sample(WORDS, rng.randint(2, 5))
+    tag = ''.join(rng.choices(string.ascii_lowercase, k=4))
+    name = f"{' '.join(w.title() for w in words)} College of Engineering {tag.title()}"
+    host = ''.join(w[:3] for w in words) + tag
+    path = rng.choice(["", "/", "/home", "/about-us", "/en/index.php"])
+    return f"https://www.{host}.{rng.choice(['ac.in', 'edu.in', 'org', 'in'])}{path}", name
+
+
+# ---- the pre-index implementation, kept here as the baseline ----
+def linear_is_duplicate(url: str, name: str, data: dict) -> bool:
+    url_clean = url.lower().rstrip('/')
+    for existing_url in data['urls']:
+        if url_clean == existing_url or url_clean in existing_url or existing_url in url_clean:
+            return True
+
+    normalized = normalize_name(name)
+    for existing in data['names']:
+        existing_norm = normalize_name(existing)
+        if normalized == existing_norm:
+            return True
+        if len(normalized) > 8 and len(existing_norm) > 8:
+            if normalized in existing_norm or existing_norm in normalized:
+                return True
+    return False
+
+
+def bench(size: int, queries: int, rng: random.Random):
+    existing = [random_college(rng) for _ in range(size)]
+    data = {'urls': set(), 'names': set()}
+    index = DedupIndex()
+    for url, name in existing:
+        data['urls'].add(url.lower().rstrip('/'))
+        data['names'].add(name)
+        index.add(url, name)
+
+    # half fresh, half variations of existing entries
+    probes = []
+    for i in range(queries):
+        if i % 2:
+            probes.append(random_college(rng))
+        else:
+            url, name = rng.choice(existing)
+            probes.append((url.rstrip('/') + "/contact", name.upper() + " Campus"))
+
+    start = time.perf_counter()
+    old = [linear_is_duplicate(u, n, data) for u, n in probes]
+    linear = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = [index.is_duplicate(u, n) for u, n in probes]
+    indexed = time.perf_counter() - start
+
+    assert old == new, "index disagrees with linear scan"
+    return linear / queries, indexed / queries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'existing':>9} {'linear us/check':>16} {'index us/check':>15}")
+    for size in args.sizes:
+        linear, indexed = bench(size, args.queries, rng)
+        print(f"{size:9d} {linear * 1e6:16.1f} {indexed * 1e6:15.1f}")
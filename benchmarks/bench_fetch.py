@@ -0,0 +1,45 @@
+"""Pages/sec: old 5-thread scrape_html pool vs the async fetch engine.
+
+    python -m benchmarks.bench_fetch --pages 200 --delay 0.2
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_servers import start_page_servers
+from scraper.scrape_utils import scrape_html
+from scraper.fetch_utils import fetch_all
+
+
+def bench_threads(urls: list) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        list(executor.map(scrape_html, urls))
+    return time.perf_counter() - start
+
+
+def bench_async(urls: list) -> float:
+    start = time.perf_counter()
+    pages = fetch_all(urls)
+    elapsed = time.perf_counter() - start
+    assert all(pages.values()), "some pages failed"
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.2)
+    args = parser.parse_args()
+
+    bases = start_page_servers(args.hosts, args.delay)
+    urls = [f"{bases[i % len(bases)]}/college/{i}" for i in range(args.pages)]
+
+    before = bench_threads(urls)
+    after = bench_async(urls)
+
+    print(f"pages={args.pages} hosts={args.hosts} server_delay={args.delay}s")
+    print(f"  before (ThreadPool x5 + scrape_html): {args.pages / before:8.1f} pages/sec")
+    print(f"  after  (AsyncFetcher):                {args.pages / after:8.1f} pages/sec")
+    print(f"  speedup: {before / after:.1f}x")
@@ -0,0 +1,111 @@
+"""Login throughput and its effect on other sync endpoints.
+
+Runs a throwaway app under uvicorn with three endpoints:
+  /login-inline  sync, argon2 verify on the shared threadpool (old login)
+  /login-pool    async, argon2 verify on HASH_POOL (new login)
+  /ping          cheap sync endpoint, stands in for the rest of the API
+
+    python -m benchmarks.bench_login --logins 200
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import time
+from threading import Thread
+
+import aiohttp
+import uvicorn
+from fastapi import FastAPI, HTTPException
+
+from auth.hash_pool import HASH_POOL, HashPoolBusy, pwd_context
+
+PASSWORD = "correct horse battery staple"
+HASHED = pwd_context.hash(PASSWORD)
+
+app = FastAPI()
+
+
+@app.post("/login-inline")
+def login_inline():
+    return {"ok": pwd_context.verify(PASSWORD, HASHED)}
+
+
+@app.post("/login-pool")
+async def login_pool():
+    try:
+        return {"ok": await HASH_POOL.verify_async(PASSWORD, HASHED)}
+    except HashPoolBusy:
+        raise HTTPException(status_code=429)
+
+
+@app.get("/ping")
+def ping():
+    return {"ok": True}
+
+
+def start_app() -> str:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+    Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_burst(base: str, path: str, logins: int) -> dict:
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+        statuses = []
+        ping_latencies = []
+
+        async def login():
+            async with session.post(base + path) as res:
+                statuses.append(res.status)
+
+        async def pinger(stop: asyncio.Event):
+            while not stop.is_set():
+                start = time.perf_counter()
+                async with session.get(base + "/ping") as res:
+                    await res.read()
+                ping_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        stop = asyncio.Event()
+        ping_task = asyncio.create_task(pinger(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await ping_task
+
+    ok = statuses.count(200)
+    ping_latencies.sort()
+    return {
+        "ok_per_sec": ok / elapsed,
+        "ok": ok,
+        "rejected_429": statuses.count(429),
+        "ping_p50_ms": statistics.median(ping_latencies) * 1000,
+        "ping_p99_ms": ping_latencies[int(len(ping_latencies) * 0.99) - 1] * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    args = parser.parse_args()
+
+    base = start_app()
+    # Warm the pool processes so spawn time isn't measured
+    asyncio.run(run_burst(base, "/login-pool", HASH_POOL.workers))
+
+    for label, path in [("inline (threadpool)", "/login-inline"), ("HASH_POOL", "/login-pool")]:
+        r = asyncio.run(run_burst(base, path, args.logins))
+        print(f"  {label:20s} logins/sec={r['ok_per_sec']:7.1f} ok={r['ok']:4d} "
+              f"429={r['rejected_429']:4d} ping p50={r['ping_p50_ms']:6.1f}ms "
+              f"p99={r['ping_p99_ms']:6.1f}ms")
+
+    HASH_POOL.shutdown()
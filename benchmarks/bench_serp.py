@@ -0,0 +1,40 @@
+"""SerpAPI pagination latency against the local stand-in.
+
+    MONGO_URL=mongodb://localhost:27017/bench python -m benchmarks.bench_serp
+
+The stub must be started before extractor.serp_utils is imported, since
+SERPAPI_URL is read at import time.
+"""
+import argparse
+import os
+import time
+
+from benchmarks.stub_servers import start_serpapi_stub
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results", type=int, default=150)
+    parser.add_argument("--delay", type=float, default=0.3)
+    args = parser.parse_args()
+
+    search_url, handler = start_serpapi_stub(["http://127.0.0.1:9"], args.results, args.delay)
+    os.environ["SERPAPI_URL"] = search_url
+
+    from extractor import serp_utils
+
+    def run(window: int, use_cache: bool) -> tuple:
+        handler.calls = 0
+        start = time.perf_counter()
+        results = []
+        for _, page in serp_utils.iter_result_pages("bench query", 200, window, use_cache):
+            results.extend(page)
+        return len(results), handler.calls, time.perf_counter() - start
+
+    for label, window, use_cache in [
+        ("sequential", 1, False),
+        (f"window={serp_utils.SERP_WINDOW}", serp_utils.SERP_WINDOW, False),
+        ("window + cache (cold)", serp_utils.SERP_WINDOW, True),
+        ("window + cache (warm)", serp_utils.SERP_WINDOW, True),
+    ]:
+        count, calls, elapsed = run(window, use_cache)
+        print(f"  {label:24s} results={count:4d} api_calls={calls:3d} {elapsed:6.2f}s")
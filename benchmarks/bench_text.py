@@ -0,0 +1,94 @@
+"""HTML-to-text cost: BeautifulSoup get_text vs the tokenizer and lxml backends.
+
+Uses saved pages when given (e.g. wget -P pages/ <college urls>), otherwise
+a generated corpus shaped like real college sites:
+    pip install -r benchmarks/requirements.txt  # BeautifulSoup, for the old path
+    python -m benchmarks.bench_text --html-dir pages/
+    python -m benchmarks.bench_text --pages 200
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from scraper.contact_utils import CONTACT_EXTRACTOR
+from scraper.text_utils import SKIPPED_TAGS, TEXT_BACKENDS, lxml, contact_href, html_to_text
+
+NAV = "".join(f'<li class="menu-item"><a href="/page-{i}">Section {i}</a></li>' for i in range(40))
+SCRIPT = '<script>window.dataLayer=[];gtag("config","G-{n:010d}");var phone="9{n:09d}";</script>'
+STYLE = "<style>.menu-item{{color:#333;margin:0 4px}} .hero{{background:url(bg@2x.png)}}</style>"
+
+
+def college_page(n: int, sections: int, rng: random.Random) -> str:
+    rows = "".join(
+        f"<tr><td>{rng.choice(['HOD', 'Professor', 'Librarian'])}</td>"
+        f"<td>Dept {i}</td><td>0{rng.randint(20, 99)}-{rng.randint(2000000, 9999999)}</td></tr>"
+        for i in range(8)
+    )
+    body = "".join(
+        f'<div class="section"><h2>Department {i} &amp; Labs</h2>'
+        f"<p>Established in 19{rng.randint(60, 99)}, the department offers B.Tech &ndash; M.Tech "
+        f"programmes with an intake of {rng.randint(60, 180)} students.</p>{SCRIPT.format(n=n + i)}</div>"
+        for i in range(sections)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>College {n}</title>{STYLE}{SCRIPT.format(n=n)}</head>"
+        f"<body><nav><ul>{NAV}</ul></nav><!-- banner 98{n:08d} -->{body}"
+        f"<table>{rows}</table>"
+        f'<footer>Email: <a href="mailto:principal@gce{n}.ac.in">Principal</a> '
+        f'Phone: <a href="tel:+91-98{n:08d}">Call us</a> <b>0{n % 90 + 10}</b> 2{n:07d}</footer>'
+        f"</body></html>"
+    )
+
+
+def bs4_text(html: str) -> str:
+    """Reference: the old BeautifulSoup path, with scripts/styles removed and links kept"""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(list(SKIPPED_TAGS)):
+        tag.decompose()
+    parts = [soup.get_text(" ")]
+    for a in soup.find_all("a", href=True):
+        href = a["href"].strip()
+        if href[:7].lower() == "mailto:" or href[:4].lower() == "tel:":
+            parts.append(contact_href(href.split("?", 1)[0]))
+    return " ".join(parts)
+
+
+def contacts_of(text: str) -> tuple:
+    contacts = CONTACT_EXTRACTOR.extract(text)
+    return set(contacts.emails), set(contacts.phones)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--html-dir", type=Path)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--sections", type=int, default=30)
+    args = parser.parse_args()
+
+    if args.html_dir:
+        pages = [p.read_text(encoding="utf-8", errors="replace") for p in sorted(args.html_dir.iterdir()) if p.is_file()]
+    else:
+        rng = random.Random(11)
+        pages = [college_page(n, args.sections, rng) for n in range(args.pages)]
+    mb = sum(len(p) for p in pages) / 1e6
+
+    backends = {"BeautifulSoup (old)": bs4_text,
+                "tokenizer": lambda page: html_to_text(page, TEXT_BACKENDS["tokenizer"])}
+    if lxml is not None:
+        backends["lxml"] = lambda page: html_to_text(page, TEXT_BACKENDS["lxml"])
+
+    reference = None
+    print(f"{len(pages)} pages, {mb:.1f} MB")
+    for name, fn in backends.items():
+        start = time.perf_counter()
+        texts = [fn(page) for page in pages]
+        elapsed = time.perf_counter() - start
+
+        found = [contacts_of(text) for text in texts]
+        if reference is None:
+            reference = found
+        agree = sum(a == b for a, b in zip(found, reference))
+        print(f"  {name:20s} {elapsed / len(pages) * 1e6:9.1f} us/page  contacts match old: {agree}/{len(pages)}")
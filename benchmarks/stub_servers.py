@@ -0,0 +1,123 @@
+"""Local stand-in HTTP servers for offline benchmarks.
+
+Run directly to serve fake college pages and a fake SerpAPI:
+    python -m benchmarks.stub_servers --hosts 20 --delay 0.2
+    SERPAPI_URL=<printed search url> uvicorn main:app
+"""
+import argparse
+import json
+import time
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+PAGE_TEMPLATE = """<html><head><title>{name}</title>
+<style>body {{ font-family: sans-serif; }}</style>
+<script>var tracking = "UA-{n:08d}";</script></head>
+<body><h1>{name}</h1>
+<p>{filler}</p>
+<footer>Contact: <a href="mailto:info@college{n}.ac.in">info@college{n}.ac.in</a>
+Phone: +91 98{n:08d}</footer></body></html>"""
+
+
+def fake_page(n: int, filler_kb: int = 20) -> bytes:
+    filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (filler_kb * 18)
+    name = f"Government College of Engineering {n}"
+    return PAGE_TEMPLATE.format(name=name, n=n, filler=filler).encode()
+
+
+def make_page_handler(delay: float, filler_kb: int):
+    class PageHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay)
+            n = int(''.join(c for c in self.path if c.isdigit()) or 0)
+            body = fake_page(n, filler_kb)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return PageHandler
+
+
+def make_serpapi_handler(page_bases: list, total_results: int, delay: float):
+    """Answers /search like SerpAPI, `total_results` hits per query then empty pages"""
+
+    class SerpApiHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        calls = 0
+
+        def do_GET(self):
+            time.sleep(delay)
+            type(self).calls += 1
+            params = parse_qs(urlparse(self.path).query)
+            start = int(params.get("start", ["0"])[0])
+            num = int(params.get("num", ["10"])[0])
+
+            results = []
+            for n in range(start, min(start + num, total_results)):
+                base = page_bases[n % len(page_bases)]
+                results.append({
+                    "position": n + 1,
+                    "title": f"Government College of Engineering {n:04d} Campus",
+                    "link": f"{base}/college/{n}",
+                })
+
+            body = json.dumps({"organic_results": results}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return SerpApiHandler
+
+
+def start_server(handler) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_page_servers(hosts: int = 20, delay: float = 0.2, filler_kb: int = 20) -> list:
+    """Start one server per fake host, returns base URLs"""
+    handler = make_page_handler(delay, filler_kb)
+    servers = [start_server(handler) for _ in range(hosts)]
+    return [f"http://127.0.0.1:{s.server_address[1]}" for s in servers]
+
+
+def start_serpapi_stub(page_bases: list, total_results: int = 150, delay: float = 0.5):
+    """Start the fake SerpAPI, returns (search URL, handler class with .calls)"""
+    handler = make_serpapi_handler(page_bases, total_results, delay)
+    server = start_server(handler)
+    return f"http://127.0.0.1:{server.server_address[1]}/search", handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--results", type=int, default=150)
+    args = parser.parse_args()
+
+    bases = start_page_servers(args.hosts, args.delay)
+    search_url, _ = start_serpapi_stub(bases, args.results)
+    for base in bases:
+        print(f"  page host: {base}")
+    print(f"  SERPAPI_URL={search_url}")
+    print("Serving, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
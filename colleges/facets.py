@@ -0,0 +1,78 @@
+import os
+import time
+from collections import Counter
+from threading import Lock
+
+from database import colleges_collection
+
+# response key -> college field
+FACETS = {
+    "districts": "city",
+    "extracted_by": "done_by",
+    "states": "state",
+}
+
+# Writes made by other worker processes show up after at most this long
+FACET_CACHE_TTL = int(os.getenv("FACET_CACHE_TTL", "120"))
+
+
+class FacetCache:
+    """In-process cache of the /colleges/filters facets, kept current by local writes"""
+
+    def __init__(self, ttl: int = FACET_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = Lock()
+        self._counts = None
+        self._loaded_at = 0.0
+
+    def _load(self) -> dict:
+        pipeline = [{"$facet": {
+            key: [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}]
+            for key, field in FACETS.items()
+        }}]
+        result = next(colleges_collection.aggregate(pipeline), {})
+        return {
+            key: Counter({row["_id"]: row["count"] for row in result.get(key, []) if row["_id"]})
+            for key in FACETS
+        }
+
+    def get(self) -> dict:
+        with self._lock:
+            if self._counts is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return self._response()
+
+        counts = self._load()
+        with self._lock:
+            self._counts = counts
+            self._loaded_at = time.monotonic()
+            return self._response()
+
+    def _response(self) -> dict:
+        response = {key: sorted(c for c in counts if counts[c] > 0)
+                    for key, counts in self._counts.items()}
+        response["counts"] = {key: dict(counts) for key, counts in self._counts.items()}
+        return response
+
+    def _apply(self, doc: dict, delta: int):
+        with self._lock:
+            if self._counts is None:
+                return
+            for key, field in FACETS.items():
+                value = doc.get(field)
+                if value:
+                    self._counts[key][value] += delta
+                    if self._counts[key][value] <= 0:
+                        del self._counts[key][value]
+
+    def note_inserted(self, doc: dict):
+        self._apply(doc, 1)
+
+    def note_deleted(self, doc: dict):
+        self._apply(doc, -1)
+
+    def invalidate(self):
+        with self._lock:
+            self._counts = None
+
+
+FACET_CACHE = FacetCache()
@@ -1,10 +1,18 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from database import colleges_collection, contacts_collection
+from colleges.facets import FACET_CACHE, FACETS
+from extractor.dedup_utils import college_keys
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+import base64
+import csv
+import io
+import os
+import tempfile
 
-import pandas as pd
-from fastapi.responses import FileResponse
-import uuid
+from openpyxl import Workbook
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
 router = APIRouter(prefix="/colleges", tags=["Colleges"])
 
@@ -12,15 +20,18 @@ router = APIRouter(prefix="/colleges", tags=["Colleges"])
 # ----------------------------
 # GET ALL COLLEGES (MAIN API)
 # ----------------------------
-# colleges/routes.py
-@router.get("")
-def get_colleges(
-    state: str = None,
-    city: str = None,
-    type: str = None,
-    skip: int = 0,
-    limit: int = 50
-):
+# Above this many matches the first-page total is reported as a lower bound
+COUNT_CAP = 10000
+# Largest keyset page; the old skip/limit list keeps limit=0 meaning "no limit"
+MAX_PAGE_SIZE = 1000
+# Fields a client may ask for with `fields`
+COLLEGE_FIELDS = {
+    "_id", "college_name", "email", "mobile", "city", "state", "region", "type",
+    "website", "done_by", "completed", "college_visited", "college_visited_by",
+}
+
+
+def build_query(state: str = None, city: str = None, type: str = None) -> dict:
     query = {}
 
     if state:
@@ -30,19 +41,118 @@ def get_colleges(
     if type and type.lower() != "all":
         query["type"] = type
 
-    colleges = list(colleges_collection.find(query).skip(skip).limit(limit))
+    return query
+
+
+def encode_cursor(last_id: ObjectId) -> str:
+    return base64.urlsafe_b64encode(last_id.binary).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    try:
+        return ObjectId(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_fields(fields: str | None) -> dict | None:
+    """"college_name,email" -> {"college_name": 1, "email": 1}"""
+    if not fields:
+        return None
+    names = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = names - COLLEGE_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return {name: 1 for name in names}
+
+
+def page_pipeline(query: dict, projection: dict | None, skip: int, limit: int) -> list:
+    pipeline = [{"$match": query}]
+    if skip:
+        pipeline.append({"$skip": skip})
+    # 0 is no limit, like find().limit(0)
+    if limit:
+        pipeline.append({"$limit": limit})
+    if projection:
+        pipeline.append({"$project": projection})
+    # ObjectId -> str on the server instead of a Python loop
+    pipeline.append({"$addFields": {"_id": {"$toString": "$_id"}}})
+    return pipeline
+
+
+def estimate_total(query: dict) -> int:
+    if not query:
+        return colleges_collection.estimated_document_count()
+    return colleges_collection.count_documents(query, limit=COUNT_CAP)
+
+
+# colleges/routes.py
+@router.get("")
+def get_colleges(
+    state: str = None,
+    city: str = None,
+    type: str = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=0),
+    cursor: str = None,
+    fields: str = None
+):
+    """List colleges, pass cursor= for keyset pages and fields= for a projection"""
+    query = build_query(state, city, type)
+    projection = parse_fields(fields)
+
+    if cursor is None:
+        return list(colleges_collection.aggregate(page_pipeline(query, projection, skip, limit)))
 
-    for c in colleges:
-        c["_id"] = str(c["_id"])
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    first_page = cursor == ""
+    if not first_page:
+        query = {**query, "_id": {"$gt": decode_cursor(cursor)}}
+
+    # One extra row tells us whether there is a next page
+    pipeline = page_pipeline(query, projection, 0, limit + 1)
+    pipeline.insert(1, {"$sort": {"_id": 1}})
+    items = list(colleges_collection.aggregate(pipeline))
+
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(ObjectId(items[-1]["_id"])) if has_more and items else None,
+        # Only computed for the first page, capped at COUNT_CAP
+        "total_estimate": estimate_total(build_query(state, city, type)) if first_page else None,
+    }
+
+# Fields the dedup keys are derived from (see extractor.dedup_utils.college_keys)
+KEY_SOURCE_FIELDS = ("college_name", "website", "city", "state", "region")
+KEY_FIELDS = ("location_key", "url_key", "name_key")
 
-    return colleges
 
 @router.put("/update/{college_id}")
 def update_college(college_id: str, payload: dict):
-    colleges_collection.update_one(
-        {"_id": ObjectId(college_id)},
-        {"$set": payload}
-    )
+    college_id = ObjectId(college_id)
+    payload = {k: v for k, v in payload.items() if k not in KEY_FIELDS}
+    update = {"$set": payload}
+
+    if any(field in payload for field in KEY_SOURCE_FIELDS):
+        current = colleges_collection.find_one(
+            {"_id": college_id}, {field: 1 for field in KEY_SOURCE_FIELDS}
+        ) or {}
+        keys = college_keys({**current, **payload})
+        update["$set"] = {**payload, **keys}
+        cleared = {field: "" for field in KEY_FIELDS if field not in keys}
+        if cleared:
+            update["$unset"] = cleared
+
+    try:
+        colleges_collection.update_one({"_id": college_id}, update)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="A college with this website or name already exists here")
+    if any(field in payload for field in FACETS.values()):
+        FACET_CACHE.invalidate()
     return {"message": "College updated"}
 
 
@@ -52,15 +162,8 @@ def update_college(college_id: str, payload: dict):
 # ----------------------------
 @router.get("/filters")
 def get_filters():
-    districts = colleges_collection.distinct("city")
-    extracted_by = colleges_collection.distinct("done_by")
-    states = colleges_collection.distinct("state")
-
-    return {
-        "districts": sorted([d for d in districts if d]),
-        "extracted_by": sorted([u for u in extracted_by if u]),
-        "states": sorted([s for s in states if s])
-    }
+    """Sorted facet values plus per-value counts, served from FACET_CACHE"""
+    return FACET_CACHE.get()
 
 
 # ----------------------------
@@ -68,7 +171,12 @@ def get_filters():
 # ----------------------------
 @router.delete("/delete/{college_id}")
 def delete_college(college_id: str):
-    colleges_collection.delete_one({"_id": ObjectId(college_id)})
+    deleted = colleges_collection.find_one_and_delete(
+        {"_id": ObjectId(college_id)},
+        projection={field: 1 for field in FACETS.values()}
+    )
+    if deleted:
+        FACET_CACHE.note_deleted(deleted)
     contacts_collection.delete_many({"college_id": ObjectId(college_id)})
     return {"message": "College deleted permanently"}
 
@@ -80,6 +188,7 @@ def delete_college(college_id: str):
 def delete_all_colleges():
     colleges_collection.delete_many({})
     contacts_collection.delete_many({})
+    FACET_CACHE.invalidate()
     return {"message": "All colleges deleted permanently"}
 
 
@@ -96,39 +205,79 @@ def mark_completed(college_id: str, completed: bool):
 
 
 # ----------------------------
-# EXPORT TO EXCEL
+# EXPORT TO EXCEL / CSV
 # ----------------------------
+# (header, field, default) - rows are streamed from the cursor in this order
+EXPORT_COLUMNS = [
+    ("College Name", "college_name", ""),
+    ("Email", "email", ""),
+    ("Mobile", "mobile", ""),
+    ("City", "city", ""),
+    ("State", "state", ""),
+    ("Region", "region", ""),
+    ("Type", "type", ""),
+    ("Website", "website", ""),
+    ("Extracted By", "done_by", ""),
+    ("Completed", "completed", False),
+    ("College Visited", "college_visited", ""),
+    ("College Visited By", "college_visited_by", ""),
+]
+EXPORT_BATCH_SIZE = 1000
+
+
+def iter_export_rows(query: dict):
+    projection = {field: 1 for _, field, _ in EXPORT_COLUMNS}
+    cursor = colleges_collection.find(query, projection).batch_size(EXPORT_BATCH_SIZE)
+    for c in cursor:
+        yield [c.get(field, default) for _, field, default in EXPORT_COLUMNS]
+
+
+def iter_csv(query: dict):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _, _ in EXPORT_COLUMNS])
+
+    for i, row in enumerate(iter_export_rows(query), start=1):
+        writer.writerow(row)
+        if i % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
 @router.get("/export/excel")
-def export_excel():
-    colleges = list(colleges_collection.find({}))
+def export_excel(state: str = None, city: str = None, type: str = None):
+    """Excel export, rows go from the cursor straight into a write-only workbook"""
+    query = build_query(state, city, type)
 
-    if not colleges:
+    if not colleges_collection.find_one(query, {"_id": 1}):
         return {"message": "No data to export"}
 
-    rows = []
-
-    for c in colleges:
-        rows.append({
-            "College Name": c.get("college_name", ""),
-            "Email": c.get("email", ""),
-            "Mobile": c.get("mobile", ""),
-            "City": c.get("city", ""),
-            "State": c.get("state", ""),
-            "Region": c.get("region", ""),
-            "Type": c.get("type", ""),
-            "Website": c.get("website", ""),
-            "Extracted By": c.get("done_by", ""),
-            "Completed": c.get("completed", False),
-            "College Visited": c.get("college_visited", ""),
-            "College Visited By": c.get("college_visited_by", "")
-        })
-
-    df = pd.DataFrame(rows)
-    filename = f"college_database_{uuid.uuid4().hex}.xlsx"
-    df.to_excel(filename, index=False)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([header for header, _, _ in EXPORT_COLUMNS])
+    for row in iter_export_rows(query):
+        sheet.append(row)
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    workbook.save(path)
 
     return FileResponse(
-        path=filename,
+        path=path,
         filename="college_database.xlsx",
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        background=BackgroundTask(os.remove, path)
+    )
+
+
+@router.get("/export/csv")
+def export_csv(state: str = None, city: str = None, type: str = None):
+    """CSV export, streamed to the client without a temp file"""
+    return StreamingResponse(
+        iter_csv(build_query(state, city, type)),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="college_database.csv"'}
     )
@@ -16,3 +16,7 @@ users_collection = db["users"]
 colleges_collection = db["colleges"]
 contacts_collection = db["contacts"]
 logs_collection = db["activity_logs"]
+serp_cache_collection = db["serp_cache"]
+serp_stats_collection = db["serp_stats"]
+jobs_collection = db["jobs"]
+meta_collection = db["meta"]
@@ -0,0 +1,116 @@
+import asyncio
+import os
+
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+
+# A batch is written when it reaches this many operations...
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "100"))
+# ...or this many seconds after its first operation, whichever comes first
+BULK_FLUSH_INTERVAL = float(os.getenv("BULK_FLUSH_INTERVAL", "0.5"))
+# Batches being written at the same time
+BULK_MAX_INFLIGHT = 2
+
+DUPLICATE_KEY = 11000
+
+
+class BulkWriteFailed(Exception):
+    """A single operation in a batch was rejected (other than a duplicate key)"""
+
+
+class BulkWriter:
+    """Buffers upserts from many coroutines into unordered bulk_write calls"""
+
+    def __init__(self, collection: Collection, batch_size: int = BULK_BATCH_SIZE,
+                 interval: float = BULK_FLUSH_INTERVAL):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.interval = interval
+
+        self._ops = []
+        self._futures = []
+        self._timer = None
+        self._flushes = set()
+        self._inflight = asyncio.Semaphore(BULK_MAX_INFLIGHT)
+
+        self.batches = 0
+        self.written = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def write(self, op) -> bool:
+        """True once inserted, False if it matched a document or hit a unique index"""
+        future = asyncio.get_running_loop().create_future()
+        self._ops.append(op)
+        self._futures.append(future)
+
+        if len(self._ops) >= self.batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.interval, self.flush)
+
+        return await future
+
+    def flush(self):
+        """Start writing the buffered operations (does not wait)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._ops:
+            return
+
+        ops, futures = self._ops, self._futures
+        self._ops, self._futures = [], []
+
+        task = asyncio.ensure_future(self._write_batch(ops, futures))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def close(self):
+        """Flush what is buffered and wait for every batch to be written"""
+        self.flush()
+        while self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def _write_batch(self, ops: list, futures: list):
+        upserted = set()
+        errors = {}
+
+        async with self._inflight:
+            try:
+                result = await asyncio.to_thread(self.collection.bulk_write, ops, ordered=False)
+                upserted = set(result.upserted_ids)
+            except BulkWriteError as e:
+                upserted = {u["index"] for u in e.details.get("upserted", [])}
+                errors = {err["index"]: err for err in e.details.get("writeErrors", [])}
+            except Exception as e:
+                # the whole batch failed (network, auth...)
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        self.batches += 1
+        self.written += len(ops)
+
+        for index, future in enumerate(futures):
+            if future.done():
+                continue  # caller went away
+            err = errors.get(index)
+            if err is None:
+                future.set_result(index in upserted)
+            elif err.get("code") == DUPLICATE_KEY:
+                future.set_result(False)
+            else:
+                future.set_exception(BulkWriteFailed(err.get("errmsg", "write failed")))
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "written": self.written,
+            "avg_batch": round(self.written / self.batches, 1) if self.batches else 0,
+        }
@@ -0,0 +1,211 @@
+import re
+from threading import RLock
+
+from sortedcontainers import SortedList
+
+# Names shorter than this only ever match exactly
+NAME_SUBSTRING_MIN = 9
+URL_ANCHOR = "http"
+
+
+def normalize_name(name: str) -> str:
+    """Normalize for duplicate detection"""
+    # Remove location suffixes
+    name = re.sub(r',?\s*\b(solapur|mumbai|pune|nashik)\b.*$', '', name, flags=re.IGNORECASE)
+    # Remove common words
+    name = re.sub(r'\b(college|institute|university|polytechnic|of|the)\b', '', name, flags=re.IGNORECASE)
+    # Clean
+    name = re.sub(r'[^\w\s]', '', name)
+    name = re.sub(r'\s+', '', name).strip().lower()
+    return name
+
+
+def normalize_url(url: str) -> str:
+    return url.lower().rstrip('/')
+
+
+def get_location_key(city: str, state: str, region: str) -> str:
+    """Location key"""
+    return f"{region}_{state}_{city}".lower().replace(" ", "_")
+
+
+def college_keys(doc: dict) -> dict:
+    """location_key/url_key/name_key of a stored college, as the unique indexes expect"""
+    keys = {"location_key": get_location_key(doc.get("city"), doc.get("state"), doc.get("region"))}
+    if doc.get("website"):
+        keys["url_key"] = normalize_url(doc["website"])
+    if doc.get("college_name"):
+        keys["name_key"] = normalize_name(doc["college_name"])
+    return keys
+
+
+def anchor_positions(text: str, anchor: str):
+    pos = text.find(anchor)
+    while pos != -1:
+        yield pos
+        pos = text.find(anchor, pos + 1)
+
+
+def has_prefix(sorted_items: SortedList, prefix: str) -> bool:
+    """True if any item starts with prefix"""
+    i = sorted_items.bisect_left(prefix)
+    return i < len(sorted_items) and sorted_items[i].startswith(prefix)
+
+
+# Same rules as the old linear scans: URLs match exactly or when either
+# normalized URL contains the other, names exactly or by containment when
+# both are > 8 chars. Containment is answered from sorted suffix lists (URL
+# suffixes only from an "http" anchor) instead of scanning every entry.
+class DedupIndex:
+    """Thread-safe duplicate index for one location's college URLs and names"""
+
+    def __init__(self):
+        self._lock = RLock()
+
+        self.urls = set()
+        self._http_urls = set()
+        self._odd_urls = []
+        self._url_suffixes = SortedList()
+
+        self.names = set()
+        self._long_names = set()
+        self._name_suffixes = SortedList()
+
+    def __len__(self):
+        return len(self.names)
+
+    # ---- insert ----
+    def add_url(self, url: str):
+        url = normalize_url(url)
+        with self._lock:
+            self._add_url(url)
+
+    def add_name(self, name: str):
+        name = normalize_name(name)
+        with self._lock:
+            self._add_name(name)
+
+    def add(self, url: str, name: str):
+        url = normalize_url(url)
+        name = normalize_name(name)
+        with self._lock:
+            self._add_url(url)
+            self._add_name(name)
+
+    def _add_url(self, url: str):
+        if url in self.urls:
+            return
+        self.urls.add(url)
+
+        if url.startswith(URL_ANCHOR):
+            self._http_urls.add(url)
+        else:
+            self._odd_urls.append(url)
+
+        for pos in anchor_positions(url, URL_ANCHOR):
+            self._url_suffixes.add(url[pos:])
+
+    def _add_name(self, name: str):
+        if name in self.names:
+            return
+        self.names.add(name)
+
+        if len(name) >= NAME_SUBSTRING_MIN:
+            self._long_names.add(name)
+            for pos in range(len(name) - NAME_SUBSTRING_MIN + 1):
+                self._name_suffixes.add(name[pos:])
+
+    # ---- remove ----
+    def _discard_url(self, url: str):
+        if url not in self.urls:
+            return
+        self.urls.discard(url)
+        self._http_urls.discard(url)
+        if url in self._odd_urls:
+            self._odd_urls.remove(url)
+        for pos in anchor_positions(url, URL_ANCHOR):
+            self._url_suffixes.discard(url[pos:])
+
+    def _discard_name(self, name: str):
+        if name not in self.names:
+            return
+        self.names.discard(name)
+        if name in self._long_names:
+            self._long_names.discard(name)
+            for pos in range(len(name) - NAME_SUBSTRING_MIN + 1):
+                self._name_suffixes.discard(name[pos:])
+
+    # ---- lookup ----
+    def has_url(self, url: str) -> bool:
+        url = normalize_url(url)
+        with self._lock:
+            return self._has_url(url)
+
+    def has_name(self, name: str) -> bool:
+        name = normalize_name(name)
+        with self._lock:
+            return self._has_name(name)
+
+    def is_duplicate(self, url: str, name: str) -> bool:
+        url = normalize_url(url)
+        name = normalize_name(name)
+        with self._lock:
+            return self._has_url(url) or self._has_name(name)
+
+    def _has_url(self, url: str) -> bool:
+        if url in self.urls:
+            return True
+
+        # new URL contained in an existing one
+        if url.startswith(URL_ANCHOR):
+            if has_prefix(self._url_suffixes, url):
+                return True
+        elif any(url in existing for existing in self.urls):
+            return True
+
+        # existing URL contained in the new one
+        for pos in anchor_positions(url, URL_ANCHOR):
+            for end in range(pos + len(URL_ANCHOR), len(url) + 1):
+                if url[pos:end] in self._http_urls:
+                    return True
+
+        return any(existing in url for existing in self._odd_urls)
+
+    def _has_name(self, name: str) -> bool:
+        if name in self.names:
+            return True
+
+        if len(name) < NAME_SUBSTRING_MIN:
+            return False
+
+        # new name contained in an existing one
+        if has_prefix(self._name_suffixes, name):
+            return True
+
+        # existing name contained in the new one
+        for pos in range(len(name) - NAME_SUBSTRING_MIN + 1):
+            for end in range(pos + NAME_SUBSTRING_MIN, len(name) + 1):
+                if name[pos:end] in self._long_names:
+                    return True
+
+        return False
+
+    # ---- atomic reserve ----
+    def claim(self, url: str, name: str) -> bool:
+        """Reserve url + name, False if either is already (nearly) taken"""
+        url = normalize_url(url)
+        name = normalize_name(name)
+        with self._lock:
+            if self._has_url(url) or self._has_name(name):
+                return False
+            self._add_url(url)
+            self._add_name(name)
+            return True
+
+    def release(self, url: str, name: str):
+        """Undo a claim whose insert failed"""
+        url = normalize_url(url)
+        name = normalize_name(name)
+        with self._lock:
+            self._discard_url(url)
+            self._discard_name(name)
@@ -0,0 +1,120 @@
+# CPU-only helpers for extraction jobs, run in the parse process pool
+import re
+
+from scraper.contact_utils import CONTACT_EXTRACTOR
+
+# MUST contain these patterns (at least one)
+REQUIRED_PATTERNS = [
+    r'\bcollege\s+of\s+engineering\b',
+    r'\binstitute\s+of\s+technology\b',
+    r'\bpolytechnic\b',
+    r'\b(engineering|technical)\s+college\b',
+    r'\buniversity\b.*\b(engineering|technology)\b',
+    r'\b(iit|nit|iiit)\b'
+]
+
+# AUTO-REJECT if title contains these
+BLACKLIST_PATTERNS = [
+    r'^(manufacturing|unit\s+address)',  # Manufacturing/Unit Address
+    r'\b(amul|dairy|milk|food|product)\b',  # Food companies
+    r'\btop\s+\d*\s*(college|university|engineering)',  # Top colleges
+    r'\bbest\s+\d*\s*(college|university)',  # Best colleges  
+    r'\blist\s+of\s+(college|private|government)',  # Lists
+    r'\d+\s*\+\s*(college|engineering|government)',  # "20+ colleges"
+    r'\b(near\s+me|in\s+\w+\s+20\d{2})\b',  # "near me", "in City 2026"
+    r'\b(how\s+to|why|what|compare|vs)\b',  # Question/comparison words
+    r'\b(connect\s+with|get\s+in\s+touch)\b',  # Contact prompts
+    r'\b(admission|entrance|exam|result|cutoff|rank)\b',  # Admission-related
+    r'\b(placement|fee|course|eligibility)\b',  # Info pages
+    r'\b(master\s+of|bachelor\s+of)\s+arts\b',  # Wrong degrees
+    r'\.(png|jpg|jpeg|webp|gif)(@\dx)?',  # Image files
+    r'\bcollege\s+of\s+(commerce|arts|science|medicine)\b',  # Non-engineering
+    r'\bmedical\s+college\b',  # Medical colleges
+    r'\b(facebook|twitter|instagram|youtube|wikipedia)\b',  # Social media
+]
+
+
+def is_valid_college(title: str, college_type: str) -> bool:
+    """Ultra-strict validation"""
+    title_lower = title.lower()
+    
+    # Check blacklist first (immediate reject)
+    for pattern in BLACKLIST_PATTERNS:
+        if re.search(pattern, title_lower):
+            return False
+    
+    # Must match at least one required pattern
+    if not any(re.search(pattern, title_lower) for pattern in REQUIRED_PATTERNS):
+        return False
+    
+    # For engineering type, must have engineering/technology/polytechnic
+    if college_type.lower() == 'engineering':
+        if not any(word in title_lower for word in ['engineering', 'technology', 'polytechnic', 'iit', 'nit']):
+            return False
+    
+    # No questions
+    if '?' in title:
+        return False
+    
+    # Digit limit
+    if sum(c.isdigit() for c in title) > 6:
+        return False
+    
+    # Length check
+    if len(title) < 20 or len(title) > 100:
+        return False
+    
+    # Word count
+    words = [w for w in title.split() if len(w) > 1]
+    if len(words) < 3 or len(words) > 12:
+        return False
+    
+    # Must start with a letter or quote
+    if not title[0].isalpha() and title[0] not in ['"', "'"]:
+        return False
+    
+    return True
+
+
+def clean_college_name(title: str, college_type: str) -> str:
+    """Clean college name"""
+    # Split and take first part
+    title = re.split(r'\s*[|–—]\s*', title)[0]
+    
+    # Remove trailing location like "- Solapur" or ", Solapur"
+    title = re.sub(r'[,\-]\s*\w+\s*$', '', title)
+    
+    # Remove years
+    title = re.sub(r'\(.*?\d{4}.*?\)', '', title)
+    title = re.sub(r'\b(est|established|since)\W*\d{4}\b', '', title, flags=re.IGNORECASE)
+    
+    # Remove image files
+    title = re.sub(r'\b\w+\.(png|jpg|jpeg|webp|gif)(@\dx)?\b', '', title, flags=re.IGNORECASE)
+    
+    # Remove abbreviations in brackets at end
+    title = re.sub(r'\s*[\[\(][A-Z]{2,10}[\]\)]\s*$', '', title)
+    
+    # Remove "..." at end
+    title = re.sub(r'\s*\.{3,}\s*$', '', title)
+    
+    # Clean whitespace
+    title = ' '.join(title.split()).strip()
+    
+    # Remove trailing punctuation
+    title = re.sub(r'[.,;:]+$', '', title).strip()
+    
+    if not is_valid_college(title, college_type):
+        return ""
+    
+    return title
+
+
+def classify_titles(titles: list, college_type: str) -> list:
+    """clean_college_name over a batch of search titles ("" = rejected)"""
+    return [clean_college_name(title, college_type) for title in titles]
+
+
+def parse_page(html: str) -> tuple:
+    """(email, mobile) of a fetched college page"""
+    contacts = CONTACT_EXTRACTOR.extract_html(html, early_stop=True)
+    return contacts.best_email(), contacts.best_phone()
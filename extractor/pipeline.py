@@ -0,0 +1,246 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from process_pool import SpawnPool
+from scraper.contact_utils import NOT_MENTIONED
+from scraper.fetch_utils import AsyncFetcher
+from extractor.bulk_writer import BULK_BATCH_SIZE
+from extractor.dedup_utils import DedupIndex
+from extractor.parse_utils import classify_titles, parse_page
+
+# Processes for title classification + page parsing (0 = threads, no pool)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Items waiting between two stages; bounds the fetched HTML held in memory
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
+# Downloads in flight per job (AsyncFetcher still applies its own limits)
+FETCH_TASKS = int(os.getenv("PIPELINE_FETCH_TASKS", "64"))
+# Inserts awaiting the bulk writer; two batches, one filling while one is written
+INSERT_TASKS = 2 * BULK_BATCH_SIZE
+# Search titles sent to the pool per classify call
+CLASSIFY_BATCH = 50
+
+DONE = object()
+
+
+class ParsePool(SpawnPool):
+    """Pool shared by every extraction job in this process"""
+
+    def __init__(self, workers: int = PARSE_WORKERS):
+        super().__init__(workers)
+
+    def executor(self) -> ProcessPoolExecutor | None:
+        """None means run_in_executor's default thread pool"""
+        if self.workers <= 0:
+            return None
+        return super().executor()
+
+    async def run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor(), fn, *args)
+
+
+PARSE_POOL = ParsePool()
+
+
+class StageStats:
+    """Counters for one pipeline stage"""
+
+    def __init__(self, name: str, tasks: int, queue: asyncio.Queue | None = None):
+        self.name = name
+        self.tasks = tasks
+        self.queue = queue
+        self.active = 0
+        self.done = 0
+        self.busy = 0.0
+
+    def begin(self) -> float:
+        self.active += 1
+        return time.perf_counter()
+
+    def end(self, started: float):
+        self.active -= 1
+        self.done += 1
+        self.busy += time.perf_counter() - started
+
+    def snapshot(self, elapsed: float) -> dict:
+        elapsed = max(elapsed, 1e-6)
+        return {
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "active": self.active,
+            "done": self.done,
+            "per_sec": round(self.done / elapsed, 2),
+            "utilization": round(min(self.busy / (elapsed * self.tasks), 1.0), 2),
+        }
+
+
+class ExtractionPipeline:
+    """classify (pool) -> claim -> fetch (async I/O) -> parse (pool) -> insert (bulk writer)"""
+
+    def __init__(self, index: DedupIndex, college_type: str, store, on_progress=None,
+                 fetcher: AsyncFetcher | None = None, pool: ParsePool = PARSE_POOL):
+        self.index = index
+        self.college_type = college_type
+        # async store(title, link, email, mobile) -> True if the college was new
+        self.store = store
+        # on_progress(processed, inserted, stages) after every finished search hit
+        self.on_progress = on_progress
+        self.fetcher = fetcher
+        self.pool = pool
+
+        self.fetch_q = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+        self.parse_q = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+        self.insert_q = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+
+        self.stages = {
+            "classify": StageStats("classify", 1),
+            "fetch": StageStats("fetch", FETCH_TASKS, self.fetch_q),
+            "parse": StageStats("parse", max(self.pool.workers, 1) * 2, self.parse_q),
+            "insert": StageStats("insert", INSERT_TASKS, self.insert_q),
+        }
+        self.processed = 0
+        self.inserted = 0
+        self._started = time.perf_counter()
+
+    def stats(self) -> dict:
+        elapsed = time.perf_counter() - self._started
+        stages = {name: stage.snapshot(elapsed) for name, stage in self.stages.items()}
+        stages["bottleneck"] = max(self.stages, key=lambda name: stages[name]["utilization"])
+        return stages
+
+    def _finished(self, inserted: bool = False):
+        self.processed += 1
+        if inserted:
+            self.inserted += 1
+        if self.on_progress is not None:
+            self.on_progress(self.processed, self.inserted, self.stats())
+
+    # ---- stages ----
+    async def _classify_page(self, items: list) -> int:
+        """Classify and claim one page of hits, returns how many were new"""
+        stage = self.stages["classify"]
+        new = 0
+        for i in range(0, len(items), CLASSIFY_BATCH):
+            batch = items[i:i + CLASSIFY_BATCH]
+            started = stage.begin()
+            try:
+                titles = await self.pool.run(
+                    classify_titles, [item.get("title", "") for item in batch], self.college_type
+                )
+            except Exception:
+                titles = [""] * len(batch)
+            stage.end(started)
+
+            for item, title in zip(batch, titles):
+                link = item.get("link", "").strip()
+                # Duplicate check + reserve, no other worker can pick it up now
+                if title and link.startswith("http") and self.index.claim(link, title):
+                    new += 1
+                    await self.fetch_q.put((title, link))
+                else:
+                    self._finished()
+        return new
+
+    async def _classify(self, pages, on_page):
+        try:
+            while True:
+                # pages may block on SerpAPI, keep it off the event loop
+                page = await asyncio.to_thread(next, pages, None)
+                if page is None:
+                    break
+                start, items = page
+                new = await self._classify_page(items)
+                if on_page is not None:
+                    on_page(start, len(items), new)
+        finally:
+            # cancels SerpAPI pages fetched ahead; skipped if cancelled while a
+            # thread is still inside next(), the generator is then closed on collection
+            if hasattr(pages, "close") and not getattr(pages, "gi_running", False):
+                pages.close()
+
+        await self.fetch_q.put(DONE)
+
+    async def _fetch(self, item: tuple) -> tuple:
+        title, link = item
+        try:
+            html = await self.fetcher.fetch(link)
+        except Exception:
+            html = None
+        return title, link, html
+
+    async def _parse(self, item: tuple) -> tuple:
+        title, link, html = item
+        email = mobile = NOT_MENTIONED
+        if html:
+            try:
+                email, mobile = await self.pool.run(parse_page, html)
+            except Exception:
+                pass
+        return title, link, email, mobile
+
+    async def _insert(self, item: tuple):
+        try:
+            ok = await self.store(*item)
+        except Exception:
+            ok = False
+        self._finished(ok)
+
+    async def _run_stage(self, name: str, fn, inq: asyncio.Queue, outq: asyncio.Queue | None):
+        stage = self.stages[name]
+        running = stage.tasks
+
+        async def worker():
+            nonlocal running
+            while True:
+                item = await inq.get()
+                if item is DONE:
+                    running -= 1
+                    # pass the marker on to this stage's other workers
+                    if running:
+                        inq.put_nowait(DONE)
+                    return
+                started = stage.begin()
+                try:
+                    result = await fn(item)
+                finally:
+                    stage.end(started)
+                if outq is not None:
+                    await outq.put(result)
+
+        await asyncio.gather(*(worker() for _ in range(stage.tasks)))
+        if outq is not None:
+            await outq.put(DONE)
+
+    async def run(self, items: list) -> int:
+        """Process every search hit, returns the number of inserted colleges"""
+        return await self.run_pages(iter([(0, items)]))
+
+    async def run_pages(self, pages, on_page=None) -> int:
+        """Like run(), reading (start, results) pages from a blocking iterator"""
+        self._started = time.perf_counter()
+
+        if self.fetcher is None:
+            async with AsyncFetcher() as fetcher:
+                self.fetcher = fetcher
+                try:
+                    return await self._run(pages, on_page)
+                finally:
+                    self.fetcher = None
+        return await self._run(pages, on_page)
+
+    async def _run(self, pages, on_page) -> int:
+        tasks = [
+            asyncio.ensure_future(self._classify(pages, on_page)),
+            asyncio.ensure_future(self._run_stage("fetch", self._fetch, self.fetch_q, self.parse_q)),
+            asyncio.ensure_future(self._run_stage("parse", self._parse, self.parse_q, self.insert_q)),
+            asyncio.ensure_future(self._run_stage("insert", self._insert, self.insert_q, None)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # a failed (or cancelled) stage would leave the others blocked on their queues
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return self.inserted
@@ -1,450 +1,370 @@
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
-import requests
+from fastapi.responses import FileResponse, StreamingResponse
+import asyncio
+import os
 import pandas as pd
 import uuid
-import os
-import re
-from typing import Dict, Set
-from threading import Thread
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from pymongo import UpdateOne
 from database import colleges_collection
-from scraper.scrape_utils import scrape_html, extract_emails, extract_phones
+from scraper.progress_utils import sse_stream, SSE_HEADERS
+from jobs.store import JOB_STORE
+from jobs.worker import WORKER, JobCancelled, JobReporter, register_handler, submit_job, get_job_status
+from extractor.serp_utils import SERPAPI_KEY, PageYield, iter_result_pages, record_query_stats
+from extractor.dedup_utils import DedupIndex, get_location_key, normalize_name, normalize_url
+from extractor.pipeline import ExtractionPipeline
+from extractor.bulk_writer import BulkWriter
+from scraper.fetch_utils import AsyncFetcher
+from locations.index import LOCATIONS
+from colleges.facets import FACET_CACHE
 from auth.auth_utils import get_current_user
 
 router = APIRouter(prefix="/extract", tags=["Extraction"])
 
-SERPAPI_KEY = os.getenv("SERPAPI_KEY") or "67e72844152500a7746da205e6f5cecd2309f794d78c2e7a6c8ddb384f5de84d"
-EXTRACTION_JOBS: Dict[str, dict] = {}
-PROCESSED_DATA: Dict[str, dict] = {}
-
-PHONE_PATTERN = re.compile(r'\+?91[-.\s]?\d{10}|\d{10}')
-EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-
-# MUST contain these patterns (at least one)
-REQUIRED_PATTERNS = [
-    r'\bcollege\s+of\s+engineering\b',
-    r'\binstitute\s+of\s+technology\b',
-    r'\bpolytechnic\b',
-    r'\b(engineering|technical)\s+college\b',
-    r'\buniversity\b.*\b(engineering|technology)\b',
-    r'\b(iit|nit|iiit)\b'
-]
-
-# AUTO-REJECT if title contains these
-BLACKLIST_PATTERNS = [
-    r'^(manufacturing|unit\s+address)',  # Manufacturing/Unit Address
-    r'\b(amul|dairy|milk|food|product)\b',  # Food companies
-    r'\btop\s+\d*\s*(college|university|engineering)',  # Top colleges
-    r'\bbest\s+\d*\s*(college|university)',  # Best colleges  
-    r'\blist\s+of\s+(college|private|government)',  # Lists
-    r'\d+\s*\+\s*(college|engineering|government)',  # "20+ colleges"
-    r'\b(near\s+me|in\s+\w+\s+20\d{2})\b',  # "near me", "in City 2026"
-    r'\b(how\s+to|why|what|compare|vs)\b',  # Question/comparison words
-    r'\b(connect\s+with|get\s+in\s+touch)\b',  # Contact prompts
-    r'\b(admission|entrance|exam|result|cutoff|rank)\b',  # Admission-related
-    r'\b(placement|fee|course|eligibility)\b',  # Info pages
-    r'\b(master\s+of|bachelor\s+of)\s+arts\b',  # Wrong degrees
-    r'\.(png|jpg|jpeg|webp|gif)(@\dx)?',  # Image files
-    r'\bcollege\s+of\s+(commerce|arts|science|medicine)\b',  # Non-engineering
-    r'\bmedical\s+college\b',  # Medical colleges
-    r'\b(facebook|twitter|instagram|youtube|wikipedia)\b',  # Social media
-]
-
-
-def normalize_name(name: str) -> str:
-    """Normalize for duplicate detection"""
-    # Remove location suffixes
-    name = re.sub(r',?\s*\b(solapur|mumbai|pune|nashik)\b.*$', '', name, flags=re.IGNORECASE)
-    # Remove common words
-    name = re.sub(r'\b(college|institute|university|polytechnic|of|the)\b', '', name, flags=re.IGNORECASE)
-    # Clean
-    name = re.sub(r'[^\w\s]', '', name)
-    name = re.sub(r'\s+', '', name).strip().lower()
-    return name
-
-
-def is_duplicate_name(name: str, location_key: str) -> bool:
-    """Check if college name exists"""
-    if location_key not in PROCESSED_DATA:
-        return False
-    
-    normalized = normalize_name(name)
-    
-    for existing in PROCESSED_DATA[location_key].get('names', set()):
-        existing_norm = normalize_name(existing)
-        
-        # Exact match
-        if normalized == existing_norm:
-            return True
-        
-        # Substring match (only if both > 8 chars)
-        if len(normalized) > 8 and len(existing_norm) > 8:
-            if normalized in existing_norm or existing_norm in normalized:
-                return True
-    
-    return False
+# Districts of a batch searched + processed at the same time
+BATCH_DISTRICTS = int(os.getenv("BATCH_DISTRICTS", "4"))
+MAX_RESULTS = 200
 
 
-def is_valid_college(title: str, college_type: str) -> bool:
-    """Ultra-strict validation"""
-    title_lower = title.lower()
-    
-    # Check blacklist first (immediate reject)
-    for pattern in BLACKLIST_PATTERNS:
-        if re.search(pattern, title_lower):
-            return False
-    
-    # Must match at least one required pattern
-    if not any(re.search(pattern, title_lower) for pattern in REQUIRED_PATTERNS):
-        return False
-    
-    # For engineering type, must have engineering/technology/polytechnic
-    if college_type.lower() == 'engineering':
-        if not any(word in title_lower for word in ['engineering', 'technology', 'polytechnic', 'iit', 'nit']):
-            return False
-    
-    # No questions
-    if '?' in title:
-        return False
-    
-    # Digit limit
-    if sum(c.isdigit() for c in title) > 6:
-        return False
-    
-    # Length check
-    if len(title) < 20 or len(title) > 100:
-        return False
-    
-    # Word count
-    words = [w for w in title.split() if len(w) > 1]
-    if len(words) < 3 or len(words) > 12:
-        return False
-    
-    # Must start with a letter or quote
-    if not title[0].isalpha() and title[0] not in ['"', "'"]:
-        return False
-    
-    return True
+def index_college(index: DedupIndex, doc: dict):
+    if doc.get('website'):
+        index.add_url(doc['website'])
+    if doc.get('college_name'):
+        index.add_name(doc['college_name'])
 
 
-def clean_college_name(title: str, college_type: str) -> str:
-    """Clean college name"""
-    # Split and take first part
-    title = re.split(r'\s*[|–—]\s*', title)[0]
-    
-    # Remove trailing location like "- Solapur" or ", Solapur"
-    title = re.sub(r'[,\-]\s*\w+\s*$', '', title)
-    
-    # Remove years
-    title = re.sub(r'\(.*?\d{4}.*?\)', '', title)
-    title = re.sub(r'\b(est|established|since)\W*\d{4}\b', '', title, flags=re.IGNORECASE)
-    
-    # Remove image files
-    title = re.sub(r'\b\w+\.(png|jpg|jpeg|webp|gif)(@\dx)?\b', '', title, flags=re.IGNORECASE)
-    
-    # Remove abbreviations in brackets at end
-    title = re.sub(r'\s*[\[\(][A-Z]{2,10}[\]\)]\s*$', '', title)
+def load_dedup_index(query: dict) -> DedupIndex:
+    """DedupIndex of the colleges already stored that match query, built per job"""
+    index = DedupIndex()
     
-    # Remove "..." at end
-    title = re.sub(r'\s*\.{3,}\s*$', '', title)
+    existing = colleges_collection.find(query, {"website": 1, "college_name": 1})
     
-    # Clean whitespace
-    title = ' '.join(title.split()).strip()
-    
-    # Remove trailing punctuation
-    title = re.sub(r'[.,;:]+$', '', title).strip()
-    
-    if not is_valid_college(title, college_type):
-        return ""
+    for doc in existing:
+        index_college(index, doc)
     
-    return title
+    return index
 
 
-def clean_phone(phone: str) -> str:
-    """Validate phone"""
-    digits = re.sub(r'\D', '', phone)
-    
-    if digits.startswith('91') and len(digits) == 12:
-        digits = digits[2:]
-    
-    # 10-digit mobile (6-9)
-    if len(digits) == 10 and digits[0] in '6789':
-        return digits
-    
-    # 11-digit landline
-    if len(digits) == 11 and digits[0] == '0':
-        return digits
-    
-    return ""
+def build_query(city: str, state: str, college_type: str) -> str:
+    if college_type.lower() == "all":
+        return f'"{city}" "{state}" college official website'
+    return f'"{city}" "{state}" {college_type} college official website'
 
 
-def is_valid_email(email: str) -> bool:
-    """Validate email"""
-    email_lower = email.lower()
-    
-    # Blacklist
-    invalid = ['noreply', 'example', 'test@', 'localhost', 'webmaster', 'postmaster']
-    if any(x in email_lower for x in invalid):
-        return False
-    
-    if '@' not in email or '.' not in email.split('@')[1]:
-        return False
+def college_upsert(doc: dict, location_key: str) -> tuple:
+    """(UpdateOne, stored doc) upserting on the unique url_key/name_key indexes"""
+    url_key = normalize_url(doc["website"])
+    doc = {**doc, "name_key": normalize_name(doc["college_name"])}
+    op = UpdateOne(
+        {"location_key": location_key, "url_key": url_key},
+        {"$setOnInsert": doc},
+        upsert=True
+    )
+    return op, doc
+
+
+async def insert_college(writer: BulkWriter, doc: dict, location_key: str) -> bool:
+    """Buffered upsert, False if the college already exists (same url or name)"""
+    op, doc = college_upsert(doc, location_key)
     
-    if len(email) < 6 or len(email) > 80:
+    if not await writer.write(op):
         return False
     
+    FACET_CACHE.note_inserted(doc)
     return True
 
 
-def extract_best_email(html: str) -> str:
-    """Extract email with scoring"""
-    emails = EMAIL_PATTERN.findall(html[:50000])
-    
-    if not emails:
-        return "Not Mentioned"
+async def store_result(writer: BulkWriter, index: DedupIndex, title: str, link: str, email: str,
+                       mobile: str, city: str, state: str, region: str, college_type: str,
+                       done_by: str, location_key: str) -> bool:
+    """Insert a claimed result, releasing the claim if the write fails"""
+    try:
+        return await insert_college(writer, {
+            "college_name": title,
+            "email": email,
+            "mobile": mobile,
+            "city": city,
+            "state": state,
+            "region": region,
+            "type": college_type,
+            "website": link,
+            "completed": False,
+            "done_by": done_by
+        }, location_key)
+    except Exception:
+        # Let a later result retry this college
+        index.release(link, title)
+        raise
+
+
+def search_pages(query: str) -> tuple:
+    """(tracker, pages) - SerpAPI pages that stop once they stop yielding new colleges"""
+    tracker = PageYield()
+    return tracker, iter_result_pages(query, max_results=MAX_RESULTS, tracker=tracker)
+
+
+def stop_reason(error: BaseException) -> str:
+    """PageYield.stopped_by for a search whose consumer failed"""
+    if isinstance(error, Exception) and not isinstance(error, JobCancelled):
+        return "error"
+    return "cancelled"
+
+
+def save_query_stats(query: str, tracker: PageYield, city: str, state: str, college_type: str):
+    try:
+        record_query_stats(query, tracker, city=city, state=state, college_type=college_type)
+    except Exception:
+        pass  # stats only, never fail the job over them
+
+
+def location_pipeline(writer: BulkWriter, index: DedupIndex, city: str, state: str,
+                      region: str, college_type: str, done_by: str, location_key: str,
+                      on_progress=None, fetcher: AsyncFetcher | None = None) -> ExtractionPipeline:
+    """Pipeline storing one location's results through writer"""
+    # classify/parse on the process pool, fetch + insert on I/O workers
+    return ExtractionPipeline(
+        index,
+        college_type,
+        store=lambda title, link, email, mobile: store_result(
+            writer, index, title, link, email, mobile, city, state, region,
+            college_type, done_by, location_key
+        ),
+        on_progress=on_progress,
+        fetcher=fetcher
+    )
+
+
+async def run_pipeline(job: JobReporter, index: DedupIndex, query: str, city: str, state: str,
+                       region: str, college_type: str, done_by: str, location_key: str) -> tuple:
+    """Search and run the extraction pipeline for one location"""
+    tracker, pages = search_pages(query)
     
-    scored = []
-    for email in set(emails):
-        if not is_valid_email(email):
-            continue
-        
-        score = 0
-        el = email.lower()
-        
-        # .edu, .ac.in - highest priority
-        if '.edu' in el or '.ac.in' in el:
-            score += 30
+    async with BulkWriter(colleges_collection) as writer:
+        pipeline = location_pipeline(
+            writer, index, city, state, region,
+            college_type, done_by, location_key,
+            on_progress=lambda processed, inserted, stages: job.update(
+                processed=processed, inserted=inserted, stages=stages, writes=writer.stats()
+            )
+        )
         
-        # Official prefixes
-        if any(el.startswith(p) for p in ['info@', 'admission@', 'office@', 'principal@', 'contact@', 'admin@']):
-            score += 20
+        def on_page(start: int, results: int, new: int):
+            tracker.record(start, results, new)
+            job.update(total_found=job.get("total_found", 0) + results, serp=tracker.stats())
         
-        # Common providers
-        if any(p in el for p in ['gmail.com', 'yahoo.com', 'rediffmail.com', 'outlook.com', 'hotmail.com']):
-            score += 10
+        try:
+            return await pipeline.run_pages(pages, on_page), tracker
+        except BaseException as e:
+            tracker.stop(stop_reason(e))
+            raise
+        finally:
+            # before job.update, which raises once the job is cancelled
+            save_query_stats(query, tracker, city, state, college_type)
+            job.update(stages=pipeline.stats(), writes=writer.stats(), serp=tracker.stats())
+
+
+def extraction_worker(job: JobReporter, region: str, state: str, city: str,
+                      college_type: str, done_by: str):
+    """Worker - pages through search results while processing them"""
+    try:
+        location_key = get_location_key(city, state, region)
+        # Rebuilt from the DB every job, so deleted colleges can be found again
+        index = load_dedup_index({"city": city})
         
-        # Domain matches college name patterns
-        if any(w in el for w in ['college', 'university', 'institute', 'polytechnic']):
-            score += 5
+        # Search pages are classified as they arrive
+        job.update(status="processing", processed=0, total_found=0)
+        inserted, tracker = asyncio.run(run_pipeline(
+            job, index, build_query(city, state, college_type), city, state, region,
+            college_type, done_by, location_key
+        ))
         
-        # Penalize personal names
-        if any(x in el for x in ['personal', 'private', 'shukla', 'kumar', 'sharma', 'gupta']):
-            score -= 20
+        found = job.get("total_found", 0)
+        if not found:
+            job.update(status="completed", message="No results found")
+            return
         
-        scored.append((score, email))
+        job.update(status="completed",
+                   message=f"Scanned {found} results in {tracker.stats()['pages']} pages, "
+                           f"found {inserted} colleges")
     
-    if not scored or max(s[0] for s in scored) < 5:
-        return "Not Mentioned"
-    
-    scored.sort(reverse=True)
-    return scored[0][1]
+    except JobCancelled:
+        raise
+    except Exception as e:
+        job.update(status="failed", error=str(e))
 
 
-def extract_best_phone(html: str) -> str:
-    """Extract phone"""
-    phones = PHONE_PATTERN.findall(html[:50000])
-    
-    for phone in phones:
-        cleaned = clean_phone(phone)
-        if cleaned:
-            return cleaned
-    
-    return "Not Mentioned"
+register_handler("extract", extraction_worker)
 
 
-def get_location_key(city: str, state: str, region: str) -> str:
-    """Location key"""
-    return f"{region}_{state}_{city}".lower().replace(" ", "_")
+# ----------------------------
+# BATCH (every district of a region/state)
+# ----------------------------
+def expand_districts(region: str, state: str | None = None) -> list:
+    """(region, state, district) for every district of a region, or of one state in it"""
+    states = LOCATIONS.data.get(region, {})
+    if state is not None:
+        states = {state: states[state]} if state in states else {}
+    return [
+        (region, state_name, district)
+        for state_name, districts in states.items()
+        for district in districts
+    ]
 
 
-def init_tracking(location_key: str, city: str):
-    """Initialize tracking"""
-    if location_key in PROCESSED_DATA:
-        return
-    
-    PROCESSED_DATA[location_key] = {
-        'urls': set(),
-        'names': set()
+def load_district_indexes(locations: list) -> dict:
+    """location_key -> DedupIndex of that district's stored colleges, from one query"""
+    keys = {
+        (state, district): get_location_key(district, state, region)
+        for region, state, district in locations
     }
+    indexes = {location_key: DedupIndex() for location_key in keys.values()}
     
-    # Load from DB
+    states = sorted({state for state, _ in keys})
     existing = colleges_collection.find(
-        {"city": city},
-        {"website": 1, "college_name": 1}
+        {"state": {"$in": states}}, {"website": 1, "college_name": 1, "state": 1, "city": 1}
     )
     
     for doc in existing:
-        if doc.get('website'):
-            PROCESSED_DATA[location_key]['urls'].add(doc['website'].lower().rstrip('/'))
-        if doc.get('college_name'):
-            PROCESSED_DATA[location_key]['names'].add(doc['college_name'])
-
-
-def is_duplicate(url: str, name: str, location_key: str) -> bool:
-    """Check duplicates"""
-    url_clean = url.lower().rstrip('/')
-    
-    # Check URL
-    for existing_url in PROCESSED_DATA[location_key]['urls']:
-        if url_clean == existing_url or url_clean in existing_url or existing_url in url_clean:
-            return True
-    
-    # Check name
-    if is_duplicate_name(name, location_key):
-        return True
+        location_key = keys.get((doc.get("state"), doc.get("city")))
+        if location_key is not None:
+            index_college(indexes[location_key], doc)
     
-    return False
+    return indexes
 
 
-def process_result(item: dict, city: str, state: str, region: str,
-                   college_type: str, done_by: str, location_key: str) -> bool:
-    """Process result"""
+class BatchProgress:
+    """Rolls per-district counters up into the batch job's status, keyed by location_key"""
+
+    def __init__(self, job: JobReporter, writer: BulkWriter, locations: list):
+        self.job = job
+        self.writer = writer
+        self.districts = {
+            get_location_key(district, state, region): {
+                "state": state, "district": district,
+                "status": "queued", "found": 0, "processed": 0, "inserted": 0
+            }
+            for region, state, district in locations
+        }
+
+    def update(self, location_key: str, **fields):
+        self.districts[location_key].update(fields)
+        self.publish()
+
+    def failed(self) -> list:
+        return [
+            {"state": row["state"], "district": row["district"]}
+            for row in self.districts.values() if row["status"] == "failed"
+        ]
+
+    def publish(self):
+        rows = self.districts.values()
+        self.job.update(
+            districts_total=len(self.districts),
+            districts_done=sum(1 for d in rows if d["status"] in ("completed", "failed")),
+            total_found=sum(d["found"] for d in rows),
+            processed=sum(d["processed"] for d in rows),
+            inserted=sum(d["inserted"] for d in rows),
+            districts=self.districts,
+            writes=self.writer.stats()
+        )
+
+
+async def extract_district(progress: BatchProgress, writer: BulkWriter, fetcher: AsyncFetcher,
+                           index: DedupIndex, region: str, state: str, district: str,
+                           college_type: str, done_by: str):
+    """Search + process one district of a batch, failures only mark the district"""
+    location_key = get_location_key(district, state, region)
+    query = build_query(district, state, college_type)
+    tracker, pages = search_pages(query)
     try:
-        raw_title = item.get("title", "")
-        title = clean_college_name(raw_title, college_type)
+        progress.update(location_key, status="processing")
         
-        if not title:
-            return False
+        pipeline = location_pipeline(
+            writer, index, district, state, region, college_type, done_by, location_key,
+            on_progress=lambda processed, inserted, stages: progress.update(
+                location_key, processed=processed, inserted=inserted
+            ),
+            fetcher=fetcher
+        )
         
-        link = item.get("link", "").strip()
-        if not link or not link.startswith('http'):
-            return False
-        
-        # Duplicate check
-        if is_duplicate(link, title, location_key):
-            return False
-        
-        # Extract contacts
-        email = "Not Mentioned"
-        mobile = "Not Mentioned"
+        def on_page(start: int, results: int, new: int):
+            tracker.record(start, results, new)
+            progress.update(location_key, found=progress.districts[location_key]["found"] + results,
+                            pages=len(tracker.pages))
         
         try:
-            html = scrape_html(link)
-            email = extract_best_email(html)
-            mobile = extract_best_phone(html)
-        except:
-            pass
-        
-        # Insert
-        colleges_collection.insert_one({
-            "college_name": title,
-            "email": email,
-            "mobile": mobile,
-            "city": city,
-            "state": state,
-            "region": region,
-            "type": college_type,
-            "website": link,
-            "completed": False,
-            "done_by": done_by
-        })
-        
-        # Mark processed
-        PROCESSED_DATA[location_key]['urls'].add(link.lower().rstrip('/'))
-        PROCESSED_DATA[location_key]['names'].add(title)
-        
-        return True
-    
-    except Exception:
-        return False
+            await pipeline.run_pages(pages, on_page)
+        except BaseException as e:
+            tracker.stop(stop_reason(e))
+            raise
+        finally:
+            save_query_stats(query, tracker, district, state, college_type)
+        progress.update(location_key, status="completed", serp_yield=tracker.stats()["yield"])
+    
+    except JobCancelled:
+        raise
+    except Exception as e:
+        progress.update(location_key, status="failed", error=str(e))
 
 
-def fetch_all_results(query: str, max_results: int = 200) -> list:
-    """Fetch ALL pages until no more results"""
-    all_results = []
-    consecutive_empty = 0
+async def run_batch(job: JobReporter, locations: list, indexes: dict,
+                    college_type: str, done_by: str) -> BatchProgress:
+    """Run every district through one fetcher and one bulk writer, deduplicating per district"""
+    pending = list(reversed(locations))
     
-    for start in range(0, max_results, 10):
+    async with AsyncFetcher() as fetcher, BulkWriter(colleges_collection) as writer:
+        progress = BatchProgress(job, writer, locations)
+        progress.publish()
+        
+        async def district_worker():
+            while pending:
+                region, state, district = pending.pop()
+                index = indexes[get_location_key(district, state, region)]
+                await extract_district(progress, writer, fetcher, index, region, state,
+                                       district, college_type, done_by)
+        
+        tasks = [asyncio.ensure_future(district_worker())
+                 for _ in range(min(BATCH_DISTRICTS, len(locations)))]
         try:
-            r = requests.get(
-                "https://serpapi.com/search",
-                params={
-                    "engine": "google",
-                    "q": query,
-                    "api_key": SERPAPI_KEY,
-                    "google_domain": "google.co.in",
-                    "gl": "in",
-                    "hl": "en",
-                    "num": 10,
-                    "start": start
-                },
-                timeout=15
-            )
-            
-            if r.status_code != 200:
-                consecutive_empty += 1
-                if consecutive_empty >= 2:
-                    break
-                continue
-            
-            results = r.json().get("organic_results", [])
-            
-            if not results:
-                consecutive_empty += 1
-                if consecutive_empty >= 2:  # Stop after 2 consecutive empty pages
-                    break
-                continue
-            
-            consecutive_empty = 0
-            all_results.extend(results)
-            
-        except Exception:
-            consecutive_empty += 1
-            if consecutive_empty >= 2:
-                break
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
     
-    return all_results
+    progress.publish()
+    return progress
 
 
-def extraction_worker(job_id: str, region: str, state: str, city: str,
-                      college_type: str, done_by: str):
-    """Worker - fetches ALL pages"""
+def batch_extraction_worker(job: JobReporter, region: str, state: str | None,
+                            college_type: str, done_by: str):
+    """Worker - extracts every district of a region or state as one job"""
     try:
-        location_key = get_location_key(city, state, region)
-        init_tracking(location_key, city)
-        
-        # Build query
-        if college_type.lower() == "all":
-            query = f'"{city}" "{state}" college official website'
-        else:
-            query = f'"{city}" "{state}" {college_type} college official website'
-        
-        # Fetch ALL results
-        EXTRACTION_JOBS[job_id]["status"] = "fetching"
-        all_results = fetch_all_results(query, max_results=200)
-        
-        EXTRACTION_JOBS[job_id]["total_found"] = len(all_results)
-        
-        if not all_results:
-            EXTRACTION_JOBS[job_id]["status"] = "completed"
-            EXTRACTION_JOBS[job_id]["message"] = "No results found"
+        locations = expand_districts(region, state)
+        if not locations:
+            job.update(status="completed", message="No districts found")
             return
         
-        EXTRACTION_JOBS[job_id]["status"] = "processing"
+        # One query for the whole batch instead of one per city
+        job.update(status="loading", districts_total=len(locations))
+        indexes = load_district_indexes(locations)
         
-        # Process in parallel
-        inserted = 0
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {
-                executor.submit(
-                    process_result,
-                    item, city, state, region, college_type, done_by, location_key
-                ): item for item in all_results
-            }
-            
-            for future in as_completed(futures):
-                EXTRACTION_JOBS[job_id]["processed"] += 1
-                if future.result():
-                    inserted += 1
-                    EXTRACTION_JOBS[job_id]["inserted"] = inserted
+        job.update(status="processing")
+        progress = asyncio.run(run_batch(job, locations, indexes, college_type, done_by))
         
-        EXTRACTION_JOBS[job_id]["status"] = "completed"
-        EXTRACTION_JOBS[job_id]["message"] = f"Scanned {len(all_results)} results, found {inserted} colleges"
-    
+        failed = progress.failed()
+        job.update(status="completed" if not failed else "incomplete",
+                   failed_districts=failed,
+                   message=f"Scanned {job.get('total_found', 0)} results in {len(locations)} "
+                           f"districts, found {job.get('inserted', 0)} colleges")
+    
+    except JobCancelled:
+        raise
     except Exception as e:
-        EXTRACTION_JOBS[job_id]["status"] = "failed"
-        EXTRACTION_JOBS[job_id]["error"] = str(e)
+        job.update(status="failed", error=str(e))
+
+
+register_handler("extract_batch", batch_extraction_worker)
 
 
 @router.post("/run")
@@ -459,28 +379,88 @@ def run_extraction(
     if not SERPAPI_KEY:
         raise HTTPException(500, "SERPAPI_KEY not configured")
     
-    job_id = uuid.uuid4().hex
+    job_id = submit_job(
+        "extract",
+        {
+            "region": region,
+            "state": state,
+            "city": city,
+            "college_type": college_type,
+            "done_by": current_user["username"]
+        },
+        owner=current_user["username"],
+        status="starting",
+        total_found=0,
+        processed=0,
+        inserted=0
+    )
     
-    EXTRACTION_JOBS[job_id] = {
-        "status": "starting",
-        "total_found": 0,
-        "processed": 0,
-        "inserted": 0
-    }
+    return {"job_id": job_id}
+
+
+@router.post("/batch")
+def run_batch_extraction(
+    region: str,
+    college_type: str,
+    state: str | None = None,
+    current_user=Depends(get_current_user)
+):
+    """Start extraction for every district of a region, or of one state in it"""
+    if not SERPAPI_KEY:
+        raise HTTPException(500, "SERPAPI_KEY not configured")
     
-    Thread(
-        target=extraction_worker,
-        args=(job_id, region, state, city, college_type, current_user["username"]),
-        daemon=True
-    ).start()
+    locations = expand_districts(region, state)
+    if not locations:
+        raise HTTPException(404, "Unknown region or state")
     
-    return {"job_id": job_id}
+    job_id = submit_job(
+        "extract_batch",
+        {
+            "region": region,
+            "state": state,
+            "college_type": college_type,
+            "done_by": current_user["username"]
+        },
+        owner=current_user["username"],
+        status="starting",
+        districts_total=len(locations),
+        districts_done=0,
+        total_found=0,
+        processed=0,
+        inserted=0
+    )
+    
+    return {"job_id": job_id, "districts": len(locations)}
 
 
 @router.get("/status/{job_id}")
 def get_status(job_id: str):
     """Status"""
-    return EXTRACTION_JOBS.get(job_id, {"status": "not_found"})
+    return get_job_status(job_id)
+
+
+@router.post("/cancel/{job_id}")
+def cancel_extraction(job_id: str, current_user=Depends(get_current_user)):
+    """Cancel a queued or running job (admin only)"""
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    result = JOB_STORE.cancel(job_id)
+    if result is None:
+        raise HTTPException(404, "No queued or running job with this id")
+    
+    WORKER.cancel_local(job_id)
+    return {"job_id": job_id, "status": result}
+
+
+@router.get("/events/{job_id}")
+def stream_status(job_id: str):
+    """Server-Sent Events stream of the job status, replaces polling /status"""
+    return StreamingResponse(
+        sse_stream(job_id, get_status),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
 
 
 @router.post("/export")
@@ -0,0 +1,238 @@
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import BoundedSemaphore
+
+from database import serp_cache_collection, serp_stats_collection
+from scraper.scrape_utils import make_session
+
+SERPAPI_KEY = os.getenv("SERPAPI_KEY") or "67e72844152500a7746da205e6f5cecd2309f794d78c2e7a6c8ddb384f5de84d"
+# Point at benchmarks/stub_servers.py to run offline
+SERPAPI_URL = os.getenv("SERPAPI_URL", "https://serpapi.com/search")
+
+# Pages requested ahead of the one being consumed
+SERP_WINDOW = int(os.getenv("SERP_WINDOW", "4"))
+# Cached pages are reused for this long, 0 disables the cache
+SERP_CACHE_TTL = int(os.getenv("SERP_CACHE_TTL", str(7 * 24 * 3600)))
+
+# SerpAPI requests in flight across every job in this process; the window
+# above is per query, this keeps concurrent jobs from burning the quota
+SERPAPI_CONCURRENCY = int(os.getenv("SERPAPI_CONCURRENCY", "4"))
+SERPAPI_SLOTS = BoundedSemaphore(SERPAPI_CONCURRENCY)
+
+# Yield-adaptive paging: a page's yield is the share of its results that
+# were new colleges (passed classification and dedup). Paging stops after
+# SERP_YIELD_PATIENCE pages in a row below SERP_MIN_YIELD...
+SERP_MIN_YIELD = float(os.getenv("SERP_MIN_YIELD", "0.1"))
+SERP_YIELD_PATIENCE = int(os.getenv("SERP_YIELD_PATIENCE", "2"))
+# ...but never before this many pages
+SERP_MIN_PAGES = int(os.getenv("SERP_MIN_PAGES", "2"))
+# Runs kept per query in serp_stats
+SERP_STATS_HISTORY = 20
+
+SERP_SESSION = make_session(pool_size=SERP_WINDOW * 4)
+
+
+# ----------------------------
+# RESULT CACHE
+# ----------------------------
+def cache_key(query: str, start: int) -> str:
+    return hashlib.sha1(f"{start}|{query}".encode()).hexdigest()
+
+
+def cache_get(query: str, start: int) -> list | None:
+    doc = serp_cache_collection.find_one({
+        "_id": cache_key(query, start),
+        "expires_at": {"$gt": datetime.utcnow()}
+    })
+    return doc["results"] if doc else None
+
+
+def cache_put(query: str, start: int, results: list):
+    serp_cache_collection.replace_one(
+        {"_id": cache_key(query, start)},
+        {
+            "query": query,
+            "start": start,
+            "results": results,
+            "expires_at": datetime.utcnow() + timedelta(seconds=SERP_CACHE_TTL)
+        },
+        upsert=True
+    )
+
+
+# ----------------------------
+# YIELD TRACKING
+# ----------------------------
+class PageYield:
+    """New-college yield of each page of one query, decides when to stop paging"""
+
+    def __init__(self, min_yield: float = SERP_MIN_YIELD, patience: int = SERP_YIELD_PATIENCE,
+                 min_pages: int = SERP_MIN_PAGES):
+        self.min_yield = min_yield
+        self.patience = patience
+        self.min_pages = min_pages
+
+        self.pages = []
+        self.requested = 0
+        self.low_streak = 0
+        # None while paging; max_results, empty, yield, cancelled or error
+        self.stopped_by = None
+
+    def record(self, start: int, results: int, new: int):
+        """Called by the consumer for a page before it asks for the next one"""
+        self.pages.append({"start": start, "results": results, "new": new})
+        if results and new / results < self.min_yield:
+            self.low_streak += 1
+        else:
+            self.low_streak = 0
+
+    def stop(self, reason: str):
+        """Record why paging ended, the first reason wins"""
+        if self.stopped_by is None:
+            self.stopped_by = reason
+
+    def should_stop(self) -> bool:
+        return len(self.pages) >= self.min_pages and self.low_streak >= self.patience
+
+    def lookahead(self, window: int) -> int:
+        """Pages to keep in flight, only one once the yield drops"""
+        # a page requested ahead costs a credit even if it is never used
+        return 1 if self.low_streak else window
+
+    def stats(self) -> dict:
+        results = sum(p["results"] for p in self.pages)
+        new = sum(p["new"] for p in self.pages)
+        return {
+            "pages": len(self.pages),
+            "requested": self.requested,
+            "results": results,
+            "new": new,
+            "yield": round(new / results, 3) if results else 0.0,
+            "per_page": [round(p["new"] / p["results"], 2) if p["results"] else 0.0
+                         for p in self.pages],
+            "stopped_by": self.stopped_by,
+        }
+
+
+def record_query_stats(query: str, tracker: PageYield, **fields):
+    """Keep the run's yield stats per query, to tune limits per city"""
+    stats = {**tracker.stats(), "at": datetime.utcnow()}
+    serp_stats_collection.update_one(
+        {"_id": query},
+        {
+            "$set": {**fields, "last": stats, "updated_at": stats["at"]},
+            "$inc": {"runs": 1, "pages": stats["pages"], "requested": stats["requested"],
+                     "results": stats["results"], "new": stats["new"]},
+            "$push": {"history": {"$each": [stats], "$slice": -SERP_STATS_HISTORY}},
+        },
+        upsert=True
+    )
+
+
+# ----------------------------
+# PAGINATION
+# ----------------------------
+def fetch_page(query: str, start: int, use_cache: bool = True) -> list | None:
+    """One page of organic results, None if the request failed"""
+    use_cache = use_cache and SERP_CACHE_TTL > 0
+
+    if use_cache:
+        try:
+            cached = cache_get(query, start)
+            if cached is not None:
+                return cached
+        except Exception:
+            pass
+
+    try:
+        with SERPAPI_SLOTS:
+            r = SERP_SESSION.get(
+                SERPAPI_URL,
+                params={
+                    "engine": "google",
+                    "q": query,
+                    "api_key": SERPAPI_KEY,
+                    "google_domain": "google.co.in",
+                    "gl": "in",
+                    "hl": "en",
+                    "num": 10,
+                    "start": start
+                },
+                timeout=15
+            )
+
+        if r.status_code != 200:
+            return None
+
+        data = r.json()
+    except Exception:
+        return None
+
+    # SerpAPI reports quota and other soft failures with a 200 and an error key
+    if data.get("error"):
+        return None
+
+    results = data.get("organic_results", [])
+
+    # An empty page may be a transient miss, caching it would end the query for a week
+    if use_cache and results:
+        try:
+            cache_put(query, start, results)
+        except Exception:
+            pass
+
+    return results
+
+
+def iter_result_pages(query: str, max_results: int = 200, window: int = SERP_WINDOW,
+                      use_cache: bool = True, tracker: PageYield | None = None):
+    """Yield (start, results) in page order, fetching `window` pages ahead"""
+    window = max(1, window)
+    tracker = tracker or PageYield(min_yield=0)
+    starts = iter(range(0, max_results, 10))
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=window)
+
+    def fill():
+        while len(pending) < tracker.lookahead(window):
+            start = next(starts, None)
+            if start is None:
+                return
+            tracker.requested += 1
+            pending.append((start, executor.submit(fetch_page, query, start, use_cache)))
+
+    consecutive_empty = 0
+
+    try:
+        fill()
+
+        while pending:
+            start, future = pending.popleft()
+            results = future.result()
+
+            if not results:
+                consecutive_empty += 1
+                if consecutive_empty >= 2:  # Stop after 2 consecutive empty pages
+                    tracker.stop("empty")
+                    break
+            else:
+                consecutive_empty = 0
+                yield start, results
+                if tracker.should_stop():
+                    tracker.stop("yield")
+                    break
+
+            fill()
+
+        tracker.stop("max_results")
+    except Exception:
+        tracker.stop("error")
+        raise
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
@@ -0,0 +1,266 @@
+"""Declared MongoDB indexes + query-plan check for the hot queries.
+
+    python indexes.py            # create / verify indexes
+    python indexes.py --explain  # flag hot queries that still COLLSCAN
+"""
+import argparse
+import logging
+import sys
+from datetime import datetime
+
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from database import db
+from extractor.dedup_utils import college_keys
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------
+# DECLARED INDEXES
+# ----------------------------
+INDEXES = {
+    "colleges": [
+        # GET /colleges filters + keyset sort, prefix also serves distinct("state")
+        IndexModel([("state", ASCENDING), ("city", ASCENDING), ("type", ASCENDING),
+                    ("_id", ASCENDING)],
+                   name="state_city_type_id"),
+        # load_dedup_index, city (+ state/type) keyset pages, distinct("city")
+        IndexModel([("city", ASCENDING), ("_id", ASCENDING)], name="city_id"),
+        # Keyset pages for the remaining filter combinations
+        IndexModel([("state", ASCENDING), ("type", ASCENDING), ("_id", ASCENDING)],
+                   name="state_type_id"),
+        IndexModel([("state", ASCENDING), ("_id", ASCENDING)], name="state_id"),
+        IndexModel([("type", ASCENDING), ("_id", ASCENDING)], name="type_id"),
+        IndexModel([("done_by", ASCENDING)], name="done_by"),
+        # Dedup keys, see extractor.routes.insert_college
+        IndexModel([("location_key", ASCENDING), ("url_key", ASCENDING)],
+                   name="unique_url_key", unique=True,
+                   partialFilterExpression={"url_key": {"$type": "string"}}),
+        IndexModel([("location_key", ASCENDING), ("name_key", ASCENDING)],
+                   name="unique_name_key", unique=True,
+                   partialFilterExpression={"name_key": {"$type": "string"}}),
+    ],
+    "contacts": [
+        IndexModel([("email", ASCENDING)], name="unique_email", unique=True,
+                   partialFilterExpression={"email": {"$type": "string"}}),
+        IndexModel([("phone", ASCENDING)], name="unique_phone", unique=True,
+                   partialFilterExpression={"phone": {"$type": "string"}}),
+        IndexModel([("college_id", ASCENDING)], name="college_id"),
+    ],
+    "users": [
+        IndexModel([("username", ASCENDING)], name="unique_username", unique=True),
+    ],
+    "scrape_pagination": [
+        # Scrape job checkpoints, see scraper.routes.scrape_college
+        IndexModel([("job_id", ASCENDING), ("college_id", ASCENDING)],
+                   name="unique_job_checkpoint", unique=True,
+                   partialFilterExpression={"kind": "checkpoint"}),
+    ],
+    "jobs": [
+        # JobStore.claim / queued_jobs - runnable jobs, oldest first
+        IndexModel([("queue_state", ASCENDING), ("created_at", ASCENDING)],
+                   name="queue_state_created"),
+        # JobStore.owner_stats - when each user last had a job started
+        IndexModel([("owner", ASCENDING), ("claimed_at", DESCENDING)],
+                   name="owner_claimed"),
+        # JobStore.find_latest
+        IndexModel([("kind", ASCENDING), ("params", ASCENDING), ("created_at", ASCENDING)],
+                   name="kind_params_created"),
+    ],
+    "serp_cache": [
+        # Mongo drops entries once expires_at has passed
+        IndexModel([("expires_at", ASCENDING)], name="ttl_expires_at", expireAfterSeconds=0),
+    ],
+    "serp_stats": [
+        # Per-city yield review when tuning SERP_MIN_YIELD / result limits
+        IndexModel([("state", ASCENDING), ("city", ASCENDING)], name="state_city"),
+    ],
+}
+
+
+def ensure_indexes() -> dict:
+    """Create each declared index on its own, returns {collection: [failed index names]}"""
+    failed = {}
+    for collection, models in INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                db[collection].create_indexes([model])
+            except PyMongoError as e:
+                logger.warning("Index %s.%s not created: %s", collection, name, e)
+                failed.setdefault(collection, []).append(name)
+
+    return failed
+
+
+# ----------------------------
+# DEDUP KEY BACKFILL
+# ----------------------------
+# meta document recording that the one-time backfill has run
+KEYS_BACKFILL_ID = "college_keys_backfill"
+BACKFILL_BATCH_SIZE = 1000
+DUPLICATE_KEY = 11000
+
+
+def write_keys(ops: list) -> tuple:
+    """(updated, duplicates) for one unordered batch of key updates"""
+    try:
+        result = db["colleges"].bulk_write(ops, ordered=False)
+        return result.modified_count, 0
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        duplicates = sum(1 for error in errors if error.get("code") == DUPLICATE_KEY)
+        if duplicates < len(errors):
+            raise
+        return e.details.get("nModified", 0), duplicates
+
+
+def backfill_college_keys() -> dict | None:
+    """One-time dedup keys for colleges stored before they existed, None if already done"""
+    if db["meta"].find_one({"_id": KEYS_BACKFILL_ID}):
+        return None
+
+    fields = ("college_name", "website", "city", "state", "region",
+              "location_key", "url_key", "name_key")
+    updated = duplicates = 0
+    ops = []
+    for doc in db["colleges"].find({}, {field: 1 for field in fields}):
+        keys = college_keys(doc)
+        # also repairs keys left stale by edits
+        if all(doc.get(field) == value for field, value in keys.items()):
+            continue
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": keys}))
+        if len(ops) >= BACKFILL_BATCH_SIZE:
+            counts = write_keys(ops)
+            updated, duplicates = updated + counts[0], duplicates + counts[1]
+            ops = []
+    if ops:
+        counts = write_keys(ops)
+        updated, duplicates = updated + counts[0], duplicates + counts[1]
+
+    if duplicates:
+        # same url/name as another college of its location, left without keys
+        logger.warning("%d colleges duplicate another one and were not given dedup keys", duplicates)
+
+    stats = {"updated": updated, "duplicates": duplicates}
+    db["meta"].update_one(
+        {"_id": KEYS_BACKFILL_ID}, {"$set": {**stats, "done_at": datetime.utcnow()}}, upsert=True
+    )
+    return stats
+
+
+# ----------------------------
+# QUERY PLAN CHECK
+# ----------------------------
+HOT_QUERIES = [
+    ("colleges", {"state": "x", "city": "x", "type": "x"}),
+    ("colleges", {"city": "x"}),
+    ("contacts", {"email": "x"}),
+    ("contacts", {"phone": "x"}),
+    ("contacts", {"college_id": "x"}),
+    ("users", {"username": "x"}),
+]
+
+# GET /colleges keyset pages: every filter combination, sorted on _id
+HOT_SORTED_QUERIES = [
+    ("colleges", {"state": "x"}),
+    ("colleges", {"city": "x"}),
+    ("colleges", {"type": "x"}),
+    ("colleges", {"state": "x", "city": "x"}),
+    ("colleges", {"state": "x", "type": "x"}),
+    ("colleges", {"city": "x", "type": "x"}),
+    ("colleges", {"state": "x", "city": "x", "type": "x"}),
+]
+
+HOT_DISTINCTS = [
+    ("colleges", "city"),
+    ("colleges", "done_by"),
+    ("colleges", "state"),
+]
+
+
+def plan_stages(plan: dict) -> list:
+    """Flatten stage names of a winning plan (classic + SBE layouts)"""
+    stages = []
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.append(node["stage"])
+        for key in ("inputStage", "queryPlan", "outerStage", "innerStage"):
+            if key in node:
+                pending.append(node[key])
+        pending.extend(node.get("inputStages", []))
+    return stages
+
+
+def explain_hot_queries() -> list:
+    """[{query, stages, collscan, sort}] for every hot query, sort = in-memory SORT"""
+    report = []
+
+    for collection, query in HOT_QUERIES:
+        plan = db[collection].find(query).explain()["queryPlanner"]["winningPlan"]
+        stages = plan_stages(plan)
+        report.append({
+            "query": f"{collection}.find({query})",
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+            "sort": False,
+        })
+
+    for collection, query in HOT_SORTED_QUERIES:
+        plan = db[collection].find(query).sort("_id", ASCENDING).explain()["queryPlanner"]["winningPlan"]
+        stages = plan_stages(plan)
+        report.append({
+            "query": f"{collection}.find({query}).sort(_id)",
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+            "sort": "SORT" in stages,
+        })
+
+    for collection, field in HOT_DISTINCTS:
+        result = db.command(
+            "explain", {"distinct": collection, "key": field}, verbosity="queryPlanner"
+        )
+        stages = plan_stages(result["queryPlanner"]["winningPlan"])
+        report.append({
+            "query": f"{collection}.distinct({field!r})",
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+            "sort": False,
+        })
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--explain", action="store_true", help="check hot query plans")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    failed = ensure_indexes()
+    print("=== INDEXES ===")
+    for collection, models in INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            status = "FAILED" if name in failed.get(collection, []) else "ok"
+            print(f"  {collection}.{name}: {status}")
+
+    backfill = backfill_college_keys()
+    print("\n=== DEDUP KEYS ===")
+    print(f"  backfill: {backfill if backfill is not None else 'already done'}")
+
+    if args.explain:
+        print("\n=== QUERY PLANS ===")
+        report = explain_hot_queries()
+        for row in report:
+            flag = "COLLSCAN" if row["collscan"] else "SORT" if row["sort"] else "ok"
+            print(f"  [{flag:8s}] {row['query']} -> {' > '.join(row['stages'])}")
+        if any(row["collscan"] or row["sort"] for row in report):
+            sys.exit(1)
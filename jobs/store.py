@@ -0,0 +1,447 @@
+import os
+import uuid
+from abc import ABC, abstractmethod
+from copy import deepcopy
+from datetime import datetime, timedelta
+from threading import Lock
+
+from pymongo import ReturnDocument
+
+# queue_state lifecycle: queued -> claimed -> finished
+QUEUED = "queued"
+CLAIMED = "claimed"
+FINISHED = "finished"
+
+# A claimed job whose worker stopped heartbeating is given to another worker
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "60"))
+# Jobs running at once across every worker process
+JOB_GLOBAL_LIMIT = int(os.getenv("JOB_GLOBAL_LIMIT", "4"))
+# Document holding the ids of the jobs that own one of those slots
+SLOTS_ID = "job_slots"
+
+CANCELLED = "cancelled"
+
+# Bookkeeping fields, hidden from the status endpoints
+INTERNAL_FIELDS = {"_id", "kind", "params", "queue_state", "worker", "heartbeat_at",
+                   "claimed_at", "cancel_requested", "created_at", "updated_at"}
+
+
+def public_view(job: dict) -> dict:
+    return {k: v for k, v in job.items() if k not in INTERNAL_FIELDS}
+
+
+def fair_order(queued: list, owners: dict) -> list:
+    """Queued jobs in the order they will be started"""
+    by_owner = {}
+    for job in queued:
+        by_owner.setdefault(job.get("owner"), []).append(job)
+
+    def turn(owner):
+        running, last_claimed = owners.get(owner, (0, None))
+        return running, last_claimed or datetime.min, by_owner[owner][0]["created_at"]
+
+    order = sorted(by_owner, key=turn)
+    rounds = max((len(jobs) for jobs in by_owner.values()), default=0)
+    return [
+        by_owner[owner][i]
+        for i in range(rounds)
+        for owner in order
+        if i < len(by_owner[owner])
+    ]
+
+
+class JobStore(ABC):
+    """Where jobs live between being queued, claimed by a worker and finished"""
+
+    @abstractmethod
+    def create(self, kind: str, params: dict, fields: dict, owner: str = None) -> str:
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    def update(self, job_id: str, fields: dict):
+        ...
+
+    @abstractmethod
+    def find_latest(self, kind: str, params: dict) -> dict | None:
+        """Newest job of this kind with exactly these params"""
+        ...
+
+    @abstractmethod
+    def requeue(self, job_id: str) -> bool:
+        """Queue a finished job again, False if it is queued or running"""
+        ...
+
+    @abstractmethod
+    def claim(self, worker_id: str, kinds: list, limit: int = JOB_GLOBAL_LIMIT) -> dict | None:
+        """Atomically take a stale job, else the next one in fair_order"""
+        ...
+
+    @abstractmethod
+    def heartbeat(self, job_ids: list, worker_id: str) -> list:
+        """Refresh the given jobs, returns the ones an admin asked to cancel"""
+        ...
+
+    @abstractmethod
+    def finish(self, job_id: str, worker_id: str):
+        ...
+
+    @abstractmethod
+    def cancel(self, job_id: str) -> str | None:
+        """"cancelled" if still queued, "cancelling" if running, None if already finished"""
+        ...
+
+    @abstractmethod
+    def queued_jobs(self, kinds: list = None) -> list:
+        """(_id, owner, created_at) of queued jobs, oldest first"""
+        ...
+
+    @abstractmethod
+    def owner_stats(self, owners: list) -> dict:
+        """owner -> (running jobs, last claimed_at)"""
+        ...
+
+    def queue_position(self, job_id: str) -> dict | None:
+        """1-based place in the start order, None unless the job is queued"""
+        queued = self.queued_jobs()
+        if not any(job["_id"] == job_id for job in queued):
+            return None
+
+        owners = self.owner_stats(list({job.get("owner") for job in queued}))
+        order = [job["_id"] for job in fair_order(queued, owners)]
+        return {"queue_position": order.index(job_id) + 1, "queue_length": len(order)}
+
+
+def new_job(kind: str, params: dict, fields: dict, owner: str = None) -> dict:
+    now = datetime.utcnow()
+    return {
+        **fields,
+        "_id": uuid.uuid4().hex,
+        "kind": kind,
+        "params": params,
+        "owner": owner,
+        "queue_state": QUEUED,
+        "worker": None,
+        "heartbeat_at": None,
+        "claimed_at": None,
+        "cancel_requested": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def stale_before() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+
+
+# ----------------------------
+# MONGO (default, shared by all processes)
+# ----------------------------
+class MongoJobStore(JobStore):
+
+    def __init__(self, collection, slots):
+        self.collection = collection
+        # meta collection, see SLOTS_ID
+        self.slots = slots
+
+    def create(self, kind, params, fields, owner=None):
+        job = new_job(kind, params, fields, owner)
+        self.collection.insert_one(job)
+        return job["_id"]
+
+    def get(self, job_id):
+        return self.collection.find_one({"_id": job_id})
+
+    def update(self, job_id, fields):
+        self.collection.update_one(
+            {"_id": job_id},
+            {"$set": {**fields, "updated_at": datetime.utcnow()}}
+        )
+
+    def find_latest(self, kind, params):
+        return self.collection.find_one(
+            {"kind": kind, "params": params},
+            sort=[("created_at", -1)]
+        )
+
+    def requeue(self, job_id):
+        result = self.collection.update_one(
+            {"_id": job_id, "queue_state": FINISHED},
+            {"$set": {"queue_state": QUEUED, "worker": None, "cancel_requested": False,
+                      "updated_at": datetime.utcnow()}}
+        )
+        return result.modified_count == 1
+
+    def _claim_update(self, worker_id):
+        now = datetime.utcnow()
+        return {"$set": {"queue_state": CLAIMED, "worker": worker_id,
+                         "heartbeat_at": now, "claimed_at": now, "updated_at": now}}
+
+    def _add_slot_holder(self, job_id, limit) -> bool:
+        """Atomically give job_id a run slot, True if it has one (it may already)"""
+        if limit <= 0:
+            return False
+        self.slots.update_one({"_id": SLOTS_ID}, {"$setOnInsert": {"holders": []}}, upsert=True)
+        result = self.slots.update_one(
+            {"_id": SLOTS_ID,
+             "$or": [{"holders": job_id}, {f"holders.{limit - 1}": {"$exists": False}}]},
+            {"$addToSet": {"holders": job_id}}
+        )
+        return result.matched_count == 1
+
+    def _prune_slots(self) -> bool:
+        """Free the slots of finished or deleted jobs, True if any were freed"""
+        holders = (self.slots.find_one({"_id": SLOTS_ID}) or {}).get("holders", [])
+        live = {
+            doc["_id"] for doc in self.collection.find(
+                {"_id": {"$in": holders}, "queue_state": {"$ne": FINISHED}}, {"_id": 1}
+            )
+        }
+        gone = [job_id for job_id in holders if job_id not in live]
+        if gone:
+            self.slots.update_one({"_id": SLOTS_ID}, {"$pull": {"holders": {"$in": gone}}})
+        return bool(gone)
+
+    def _take_slot(self, job_id, limit) -> bool:
+        if self._add_slot_holder(job_id, limit):
+            return True
+        # a worker may have died between finishing a job and freeing its slot
+        return self._prune_slots() and self._add_slot_holder(job_id, limit)
+
+    def claim(self, worker_id, kinds, limit=JOB_GLOBAL_LIMIT):
+        stale = stale_before()
+        claimable = {"$or": [{"queue_state": QUEUED},
+                             {"queue_state": CLAIMED, "heartbeat_at": {"$lt": stale}}]}
+
+        # A job whose worker died already had its turn, resume it first
+        dead = self.collection.find_one(
+            {"kind": {"$in": kinds}, "queue_state": CLAIMED, "heartbeat_at": {"$lt": stale}},
+            {"_id": 1},
+            sort=[("created_at", 1)]
+        )
+        if dead:
+            candidates = [dead]
+        else:
+            queued = self.queued_jobs(kinds)
+            owners = self.owner_stats(list({j.get("owner") for j in queued}))
+            candidates = fair_order(queued, owners)
+
+        for candidate in candidates:
+            # Slot first: reserving it is the atomic global cap check
+            if not self._take_slot(candidate["_id"], limit):
+                return None
+
+            job = self.collection.find_one_and_update(
+                {"_id": candidate["_id"], **claimable},
+                self._claim_update(worker_id),
+                return_document=ReturnDocument.AFTER
+            )
+            if job:
+                return job
+            # Lost the race for this one, try the next in line. The slot stays
+            # with the job: its new worker runs it, or it finished and is pruned.
+        return None
+
+    def heartbeat(self, job_ids, worker_id):
+        self.collection.update_many(
+            {"_id": {"$in": job_ids}, "worker": worker_id},
+            {"$set": {"heartbeat_at": datetime.utcnow()}}
+        )
+        return [
+            doc["_id"] for doc in self.collection.find(
+                {"_id": {"$in": job_ids}, "worker": worker_id, "cancel_requested": True},
+                {"_id": 1}
+            )
+        ]
+
+    def finish(self, job_id, worker_id):
+        result = self.collection.update_one(
+            {"_id": job_id, "worker": worker_id},
+            {"$set": {"queue_state": FINISHED, "updated_at": datetime.utcnow()}}
+        )
+        # a worker the job was taken from must not free its new worker's slot
+        if result.matched_count:
+            self.slots.update_one({"_id": SLOTS_ID}, {"$pull": {"holders": job_id}})
+
+    def cancel(self, job_id):
+        now = datetime.utcnow()
+        result = self.collection.update_one(
+            {"_id": job_id, "queue_state": QUEUED},
+            {"$set": {"queue_state": FINISHED, "status": CANCELLED, "updated_at": now}}
+        )
+        if result.modified_count:
+            return CANCELLED
+
+        result = self.collection.update_one(
+            {"_id": job_id, "queue_state": CLAIMED},
+            {"$set": {"cancel_requested": True, "updated_at": now}}
+        )
+        return "cancelling" if result.matched_count else None
+
+    def queued_jobs(self, kinds=None):
+        query = {"queue_state": QUEUED}
+        if kinds is not None:
+            query["kind"] = {"$in": kinds}
+        return list(self.collection.find(
+            query, {"owner": 1, "created_at": 1}, sort=[("created_at", 1)]
+        ))
+
+    def owner_stats(self, owners):
+        stale = stale_before()
+        rows = self.collection.aggregate([
+            {"$match": {"owner": {"$in": owners}, "claimed_at": {"$ne": None}}},
+            {"$group": {
+                "_id": "$owner",
+                "last_claimed": {"$max": "$claimed_at"},
+                "running": {"$sum": {"$cond": [
+                    {"$and": [{"$eq": ["$queue_state", CLAIMED]},
+                              {"$gte": ["$heartbeat_at", stale]}]}, 1, 0
+                ]}},
+            }},
+        ])
+        return {row["_id"]: (row["running"], row["last_claimed"]) for row in rows}
+
+
+# ----------------------------
+# IN-MEMORY (tests / single process)
+# ----------------------------
+class MemoryJobStore(JobStore):
+
+    def __init__(self):
+        self._lock = Lock()
+        self._jobs = {}
+
+    def create(self, kind, params, fields, owner=None):
+        job = new_job(kind, params, fields, owner)
+        with self._lock:
+            self._jobs[job["_id"]] = job
+        return job["_id"]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return deepcopy(job) if job else None
+
+    def update(self, job_id, fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(deepcopy(fields), updated_at=datetime.utcnow())
+
+    def find_latest(self, kind, params):
+        with self._lock:
+            matches = [j for j in self._jobs.values()
+                       if j["kind"] == kind and j["params"] == params]
+            if not matches:
+                return None
+            return deepcopy(max(matches, key=lambda j: j["created_at"]))
+
+    def requeue(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["queue_state"] != FINISHED:
+                return False
+            job.update(queue_state=QUEUED, worker=None, cancel_requested=False,
+                       updated_at=datetime.utcnow())
+            return True
+
+    def claim(self, worker_id, kinds, limit=JOB_GLOBAL_LIMIT):
+        now = datetime.utcnow()
+        stale = stale_before()
+        with self._lock:
+            # reclaims count against the limit too
+            running = sum(
+                1 for j in self._jobs.values()
+                if j["queue_state"] == CLAIMED and j["heartbeat_at"] >= stale
+            )
+            if running >= limit:
+                return None
+
+            dead = [
+                j for j in self._jobs.values()
+                if j["kind"] in kinds and j["queue_state"] == CLAIMED and j["heartbeat_at"] < stale
+            ]
+            if dead:
+                job = min(dead, key=lambda j: j["created_at"])
+            else:
+                queued = self._queued(kinds)
+                if not queued:
+                    return None
+                owners = self._owner_stats({j["owner"] for j in queued}, stale)
+                job = self._jobs[fair_order(queued, owners)[0]["_id"]]
+
+            job.update(queue_state=CLAIMED, worker=worker_id, heartbeat_at=now,
+                       claimed_at=now, updated_at=now)
+            return deepcopy(job)
+
+    def heartbeat(self, job_ids, worker_id):
+        now = datetime.utcnow()
+        cancelled = []
+        with self._lock:
+            for job_id in job_ids:
+                job = self._jobs.get(job_id)
+                if job and job["worker"] == worker_id:
+                    job["heartbeat_at"] = now
+                    if job["cancel_requested"]:
+                        cancelled.append(job_id)
+        return cancelled
+
+    def finish(self, job_id, worker_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job and job["worker"] == worker_id:
+                job.update(queue_state=FINISHED, updated_at=datetime.utcnow())
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            if job["queue_state"] == QUEUED:
+                job.update(queue_state=FINISHED, status=CANCELLED, updated_at=datetime.utcnow())
+                return CANCELLED
+            if job["queue_state"] == CLAIMED:
+                job.update(cancel_requested=True, updated_at=datetime.utcnow())
+                return "cancelling"
+            return None
+
+    def _queued(self, kinds=None):
+        queued = [
+            j for j in self._jobs.values()
+            if j["queue_state"] == QUEUED and (kinds is None or j["kind"] in kinds)
+        ]
+        return sorted(queued, key=lambda j: j["created_at"])
+
+    def _owner_stats(self, owners, stale):
+        stats = {}
+        for j in self._jobs.values():
+            if j["owner"] not in owners or j["claimed_at"] is None:
+                continue
+            running, last = stats.get(j["owner"], (0, None))
+            if j["queue_state"] == CLAIMED and j["heartbeat_at"] >= stale:
+                running += 1
+            stats[j["owner"]] = (running, max(last or j["claimed_at"], j["claimed_at"]))
+        return stats
+
+    def queued_jobs(self, kinds=None):
+        with self._lock:
+            return [{"_id": j["_id"], "owner": j["owner"], "created_at": j["created_at"]}
+                    for j in self._queued(kinds)]
+
+    def owner_stats(self, owners):
+        with self._lock:
+            return self._owner_stats(set(owners), stale_before())
+
+
+def make_job_store() -> JobStore:
+    """JOB_STORE=memory for tests, Mongo otherwise"""
+    if os.getenv("JOB_STORE", "mongo").lower() == "memory":
+        return MemoryJobStore()
+
+    from database import jobs_collection, meta_collection
+    return MongoJobStore(jobs_collection, meta_collection)
+
+
+JOB_STORE = make_job_store()
@@ -0,0 +1,158 @@
+import logging
+import os
+import socket
+import uuid
+from threading import Event, Lock, Thread
+
+from jobs.store import CANCELLED, JOB_STORE, QUEUED, JobStore, public_view
+from scraper.progress_utils import JOB_EVENTS, ProgressWriter
+
+logger = logging.getLogger(__name__)
+
+# Jobs one process runs at the same time
+JOB_SLOTS = int(os.getenv("JOB_SLOTS", "2"))
+JOB_POLL_INTERVAL = 1.0
+HEARTBEAT_INTERVAL = 10
+
+# kind -> handler(job: JobReporter, **params)
+HANDLERS = {}
+
+
+class JobCancelled(Exception):
+    """Raised from JobReporter.update once an admin cancelled the job"""
+
+
+def register_handler(kind: str, handler):
+    HANDLERS[kind] = handler
+
+
+def submit_job(kind: str, params: dict, owner: str = None, **fields) -> str:
+    """Queue a job, any worker process with a handler for `kind` may run it"""
+    return JOB_STORE.create(kind, params, fields, owner)
+
+
+def get_job_status(job_id: str) -> dict:
+    job = JOB_STORE.get(job_id)
+    if not job:
+        return {"status": "not_found"}
+
+    status = public_view(job)
+    if job["queue_state"] == QUEUED:
+        status.update(JOB_STORE.queue_position(job_id) or {})
+    return status
+
+
+class JobReporter:
+    """Handle a running job reports through, raises JobCancelled once it is cancelled"""
+
+    def __init__(self, store: JobStore, job: dict):
+        self.job_id = job["_id"]
+        self.snapshot = public_view(job)
+        self.cancelled = Event()
+        self._writer = ProgressWriter(lambda fields: store.update(self.job_id, fields))
+
+    def __getitem__(self, key):
+        return self.snapshot[key]
+
+    def get(self, key, default=None):
+        return self.snapshot.get(key, default)
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def update(self, **fields):
+        if self.cancelled.is_set() and "status" not in fields:
+            raise JobCancelled(self.job_id)
+        self.snapshot.update(fields)
+        JOB_EVENTS.publish(self.job_id, self.snapshot)
+        self._writer.update(**fields)
+        if "status" in fields:
+            self._writer.flush()
+
+    def flush(self):
+        self._writer.flush()
+
+
+class JobWorker:
+    """Claims jobs from the store and runs them, one of these per process"""
+
+    def __init__(self, store: JobStore = JOB_STORE, slots: int = JOB_SLOTS):
+        self.store = store
+        self.slots = slots
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._running = {}
+        self._lock = Lock()
+        self._stop = Event()
+
+    def start(self):
+        self._stop.clear()
+        Thread(target=self._claim_loop, daemon=True).start()
+        Thread(target=self._heartbeat_loop, daemon=True).start()
+
+    def stop(self):
+        """Stop claiming, running jobs are picked up elsewhere once stale"""
+        self._stop.set()
+
+    def running(self) -> list:
+        with self._lock:
+            return list(self._running)
+
+    def cancel_local(self, job_id: str) -> bool:
+        """Stop a job if this process runs it, others notice on their heartbeat"""
+        with self._lock:
+            reporter = self._running.get(job_id)
+        if reporter is None:
+            return False
+        reporter.cancel()
+        return True
+
+    def _claim_loop(self):
+        while not self._stop.is_set():
+            job = None
+            if HANDLERS and len(self.running()) < self.slots:
+                try:
+                    job = self.store.claim(self.worker_id, list(HANDLERS))
+                except Exception:
+                    logger.exception("Job claim failed")
+
+            if job:
+                reporter = JobReporter(self.store, job)
+                with self._lock:
+                    self._running[job["_id"]] = reporter
+                Thread(target=self._run, args=(job, reporter), daemon=True).start()
+                continue
+
+            self._stop.wait(JOB_POLL_INTERVAL)
+
+    def _run(self, job: dict, reporter: JobReporter):
+        try:
+            HANDLERS[job["kind"]](reporter, **job["params"])
+            if reporter.cancelled.is_set():
+                reporter.update(status=CANCELLED)
+        except JobCancelled:
+            logger.info("Job %s cancelled", job["_id"])
+            reporter.update(status=CANCELLED)
+        except Exception as e:
+            logger.exception("Job %s failed", job["_id"])
+            reporter.update(status="failed", error=str(e))
+        finally:
+            reporter.flush()
+            self.store.finish(job["_id"], self.worker_id)
+            with self._lock:
+                self._running.pop(job["_id"], None)
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            job_ids = self.running()
+            if not job_ids:
+                continue
+            try:
+                cancelled = self.store.heartbeat(job_ids, self.worker_id)
+            except Exception:
+                logger.exception("Job heartbeat failed")
+                continue
+            for job_id in cancelled:
+                self.cancel_local(job_id)
+
+
+WORKER = JobWorker()
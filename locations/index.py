@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left
+from itertools import islice
+from pathlib import Path
+
+# Single source of truth for regions -> states -> districts
+DATA_PATH = Path(__file__).resolve().parent / "india_locations.json"
+# state -> city name people search for -> the districts covering it
+ALIASES_PATH = Path(__file__).resolve().parent / "district_aliases.json"
+
+LOCATIONS_MAX_AGE = int(os.getenv("LOCATIONS_MAX_AGE", "86400"))
+SEARCH_LIMIT = 10
+
+
+def normalize_key(text: str) -> str:
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", (text or "").casefold()).split())
+
+
+class CachedResponse:
+    """JSON body serialized once, with a strong ETag over the bytes."""
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest()[:20] + '"'
+
+    def matches(self, if_none_match: str) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return self.etag in tags
+
+
+class LocationIndex:
+    """Location responses, reverse lookup and prefix search, built once from the JSON"""
+
+    def __init__(self, data: dict, aliases: dict = None):
+        self.data = data
+        self.empty = CachedResponse([])
+
+        self.regions = CachedResponse(list(data.keys()))
+        self.states = {region: CachedResponse(list(states.keys())) for region, states in data.items()}
+        self.districts = {
+            (region, state): CachedResponse(districts)
+            for region, states in data.items()
+            for state, districts in states.items()
+        }
+
+        # reverse lookup: normalized district/state -> where it lives
+        self.by_district = {}
+        self.by_state = {}
+        entries = []
+        for region, states in data.items():
+            for state, districts in states.items():
+                state_entry = {"type": "state", "name": state, "state": state, "region": region}
+                self.by_state.setdefault(normalize_key(state), []).append(state_entry)
+                entries.append(state_entry)
+                for district in districts:
+                    entry = {"type": "district", "name": district, "state": state, "region": region}
+                    self.by_district.setdefault(normalize_key(district), []).append(entry)
+                    entries.append(entry)
+
+        # city aliases resolve to their districts, they are not districts themselves
+        alias_keys = []
+        district_pos = {(e["state"], e["name"]): pos for pos, e in enumerate(entries)
+                        if e["type"] == "district"}
+        for state, cities in (aliases or {}).items():
+            for city, districts in cities.items():
+                for district in districts:
+                    pos = district_pos.get((state, district))
+                    if pos is None:
+                        continue
+                    self.by_district.setdefault(normalize_key(city), []).append(entries[pos])
+                    alias_keys.append((normalize_key(city), 1, pos))
+
+        # prefix index: (key, rank, position) where rank 0 = whole name, 1 = later word
+        self.entries = entries
+        keys = []
+        for pos, entry in enumerate(entries):
+            key = normalize_key(entry["name"])
+            keys.append((key, 0, pos))
+            words = key.split(" ")
+            for i in range(1, len(words)):
+                keys.append((" ".join(words[i:]), 1, pos))
+        keys.extend(alias_keys)
+        keys.sort()
+        self._keys = keys
+        self._key_strings = [k[0] for k in keys]
+
+    # ---- precomputed responses ----
+    def states_response(self, region: str) -> CachedResponse:
+        return self.states.get(region, self.empty)
+
+    def districts_response(self, region: str, state: str) -> CachedResponse:
+        return self.districts.get((region, state), self.empty)
+
+    # ---- reverse lookup ----
+    def lookup(self, name: str) -> list:
+        key = normalize_key(name)
+        return self.by_district.get(key, []) + self.by_state.get(key, [])
+
+    # ---- autocomplete ----
+    def search(self, prefix: str, limit: int = SEARCH_LIMIT, kind: str = None) -> list:
+        prefix = normalize_key(prefix)
+        if not prefix:
+            return []
+
+        start = bisect_left(self._key_strings, prefix)
+        hits = []
+        for key, rank, pos in islice(self._keys, start, None):
+            if not key.startswith(prefix):
+                break
+            entry = self.entries[pos]
+            if kind and entry["type"] != kind:
+                continue
+            hits.append((rank, entry["type"] != "state", len(key), key, pos))
+
+        # whole-name matches first, states before districts, shorter names first
+        hits.sort()
+        results = []
+        seen = set()
+        for *_, pos in hits:
+            if pos in seen:
+                continue
+            seen.add(pos)
+            results.append(self.entries[pos])
+            if len(results) >= limit:
+                break
+        return results
+
+
+def load_index(path: Path = DATA_PATH, aliases_path: Path = ALIASES_PATH) -> LocationIndex:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    with open(aliases_path, "r", encoding="utf-8") as f:
+        aliases = json.load(f)
+    return LocationIndex(data, aliases)
+
+
+LOCATIONS = load_index()
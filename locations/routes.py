@@ -1,34 +1,58 @@
 # locations/routes.py
-from fastapi import APIRouter
-import json
-from pathlib import Path
+from fastapi import APIRouter, Header, Query, Response
+from typing import Optional
+
+from locations.index import LOCATIONS, LOCATIONS_MAX_AGE, SEARCH_LIMIT, CachedResponse
 
 
 router = APIRouter(prefix="/locations", tags=["Locations"])
 
-# Load India JSON once (FAST + OFFLINE)
-DATA_PATH = Path(__file__).resolve().parent / "india_locations.json"
 
-with open(DATA_PATH, "r", encoding="utf-8") as f:
-    INDIA = json.load(f)
+def cached_json(cached: CachedResponse, if_none_match: Optional[str]) -> Response:
+    # bodies are serialized at startup; a matching ETag costs nothing
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={LOCATIONS_MAX_AGE}",
+    }
+    if cached.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
 
 # -----------------------------
 # GET REGIONS
 # -----------------------------
 @router.get("/regions")
-def get_regions():
-    return list(INDIA.keys())
+async def get_regions(if_none_match: Optional[str] = Header(None)):
+    return cached_json(LOCATIONS.regions, if_none_match)
 
 # -----------------------------
 # GET STATES BY REGION
 # -----------------------------
 @router.get("/states")
-def get_states(region: str):
-    return list(INDIA.get(region, {}).keys())
+async def get_states(region: str, if_none_match: Optional[str] = Header(None)):
+    return cached_json(LOCATIONS.states_response(region), if_none_match)
 
 # -----------------------------
 # GET DISTRICTS BY STATE
 # -----------------------------
 @router.get("/districts")
-def get_districts(region: str, state: str):
-    return INDIA.get(region, {}).get(state, [])
+async def get_districts(region: str, state: str, if_none_match: Optional[str] = Header(None)):
+    return cached_json(LOCATIONS.districts_response(region, state), if_none_match)
+
+# -----------------------------
+# AUTOCOMPLETE DISTRICTS / STATES
+# -----------------------------
+@router.get("/search")
+async def search_locations(
+    q: str = Query(..., min_length=1),
+    kind: Optional[str] = Query(None, pattern="^(state|district)$"),
+    limit: int = Query(SEARCH_LIMIT, ge=1, le=50)
+):
+    return LOCATIONS.search(q, limit=limit, kind=kind)
+
+# -----------------------------
+# REVERSE LOOKUP (district/state -> state, region)
+# -----------------------------
+@router.get("/lookup")
+async def lookup_location(name: str = Query(..., min_length=1)):
+    return LOCATIONS.lookup(name)
@@ -1,37 +1,16 @@
-from pymongo import MongoClient
+# Seeds the Mongo "locations" collection from locations/india_locations.json,
+# the same index the /locations API serves.
+from database import db
+from locations.index import LOCATIONS
 
-client = MongoClient("mongodb://localhost:27017")
-db = client["college_scraper_db"]
 locations = db["locations"]
 
 locations.delete_many({})  # reset
 
 locations.insert_many([
-    {
-        "region": "South",
-        "state": "Karnataka",
-        "cities": ["Bengaluru", "Dharwad", "Hubli", "Belagavi", "Mysuru"]
-    },
-    {
-        "region": "South",
-        "state": "Tamil Nadu",
-        "cities": ["Chennai", "Coimbatore", "Madurai", "Trichy"]
-    },
-    {
-        "region": "West",
-        "state": "Maharashtra",
-        "cities": ["Mumbai", "Pune", "Nagpur", "Nashik"]
-    },
-    {
-        "region": "North",
-        "state": "Delhi",
-        "cities": ["New Delhi"]
-    },
-    {
-        "region": "East",
-        "state": "West Bengal",
-        "cities": ["Kolkata", "Howrah", "Durgapur"]
-    }
+    {"region": region, "state": state, "cities": districts}
+    for region, states in LOCATIONS.data.items()
+    for state, districts in states.items()
 ])
 
 print("Location data inserted successfully")
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -8,10 +9,33 @@ from users.routes import router as users_router
 from colleges.routes import router as colleges_router
 from extractor.routes import router as extract_router
 from locations.routes import router as locations_router
+from scraper.routes import router as scrape_router
+from scraper.progress import router as progress_router
+from indexes import backfill_college_keys, ensure_indexes
+from jobs.worker import WORKER
+from auth.hash_pool import HASH_POOL
+from scraper.pdf_utils import PDF_POOL
+from extractor.pipeline import PARSE_POOL
 
 load_dotenv()
 
-app = FastAPI(title="College Placement Contact Extractor")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Idempotent, existing indexes are left as they are
+    ensure_indexes()
+    # One-time, needs the unique indexes above to skip duplicate colleges
+    backfill_college_keys()
+    # Every uvicorn worker process claims and runs queued jobs
+    WORKER.start()
+    yield
+    WORKER.stop()
+    HASH_POOL.shutdown()
+    PDF_POOL.shutdown()
+    PARSE_POOL.shutdown()
+
+
+app = FastAPI(title="College Placement Contact Extractor", lifespan=lifespan)
 
 # ---- CORS CONFIG (FINAL & CORRECT) ----
 FRONTEND_URL = os.getenv("FRONTEND_URL")
@@ -39,6 +63,8 @@ app.include_router(users_router, prefix="/api")
 app.include_router(colleges_router, prefix="/api")
 app.include_router(extract_router, prefix="/api")
 app.include_router(locations_router, prefix="/api")
+app.include_router(scrape_router, prefix="/api")
+app.include_router(progress_router, prefix="/api")
 
 # ---- HEALTH CHECK ----
 @app.get("/")
@@ -0,0 +1,44 @@
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from threading import Lock
+
+
+class SpawnPool:
+    """Lazily started spawn pool; what it runs must be in modules importable without the DB"""
+
+    def __init__(self, workers: int, max_tasks_per_child: int | None = None):
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self._lock = Lock()
+        self._executor = None
+
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process that holds Mongo client threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_child
+                )
+            return self._executor
+
+    def submit(self, fn, *args) -> Future:
+        return self.executor().submit(fn, *args)
+
+    def recycle(self, executor: ProcessPoolExecutor):
+        """Kill executor's processes, e.g. one stuck on a task; the next submit starts a new pool"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # no public way to stop a busy worker before Python 3.14; its pending
+        # futures fail with BrokenProcessPool
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,290 @@
+import re
+from bisect import bisect_right
+
+from scraper.text_utils import hidden_spans, iter_text_chunks
+
+# One pattern for both contact kinds so a document is walked once. The
+# leading lookahead lets the regex engine skip straight to "@", "+" or a
+# digit; the email local part is recovered by walking back from the "@".
+# Lookarounds stop phones from starting or ending inside a longer digit run.
+CONTACT_PATTERN = re.compile(
+    r"(?=[@+\d])(?:"
+    r"@(?P<domain>[A-Za-z0-9.-]+\.[A-Za-z]{2,})"
+    r"|(?<![\d+])(?P<phone>\+?91[-.\s]{0,2}\d{10}|0\d{2,4}[\s\-]{0,2}\d{6,8}|\d{10})(?!\d)"
+    r")"
+)
+LOCAL_PART_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-")
+MAX_LOCAL_PART = 64
+
+# Chunked scanning: a match is only accepted if it starts SCAN_OVERLAP chars
+# before the end of the buffered text, so it cannot be cut by a chunk edge
+# (valid emails are <= 80 chars). SCAN_CONTEXT chars are kept in front of
+# the next chunk for lookbehinds and the email local part.
+SCAN_OVERLAP = 128
+SCAN_CONTEXT = MAX_LOCAL_PART + 1
+
+# Footers and contact sections are scanned first; case variants are listed
+# because plain str.find is much faster than a case-insensitive regex
+PRIORITY_MARKERS = ("<footer", "footer", "Footer", "contact", "Contact", "CONTACT")
+PRIORITY_WINDOW_CHARS = 16 * 1024
+MAX_PRIORITY_WINDOWS = 3
+
+NOT_MENTIONED = "Not Mentioned"
+
+# Best email must reach this score, otherwise it is "Not Mentioned"
+MIN_EMAIL_SCORE = 5
+# An early-stopping scan ends once it has an email this good and a phone
+CONFIDENT_EMAIL_SCORE = 30
+
+INVALID_EMAIL_PARTS = ['noreply', 'example', 'test@', 'localhost', 'webmaster', 'postmaster']
+OFFICIAL_PREFIXES = ('info@', 'admission@', 'office@', 'principal@', 'contact@', 'admin@')
+COMMON_PROVIDERS = ['gmail.com', 'yahoo.com', 'rediffmail.com', 'outlook.com', 'hotmail.com']
+INSTITUTION_WORDS = ['college', 'university', 'institute', 'polytechnic']
+PERSONAL_WORDS = ['personal', 'private', 'shukla', 'kumar', 'sharma', 'gupta']
+
+
+def is_valid_email(email: str) -> bool:
+    """Validate email"""
+    email_lower = email.lower()
+
+    # Blacklist
+    if any(x in email_lower for x in INVALID_EMAIL_PARTS):
+        return False
+
+    if '@' not in email or '.' not in email.split('@')[1]:
+        return False
+
+    if len(email) < 6 or len(email) > 80:
+        return False
+
+    return True
+
+
+def score_email(email: str) -> int:
+    """Higher is more likely the college's official address"""
+    score = 0
+    el = email.lower()
+
+    # .edu, .ac.in - highest priority
+    if '.edu' in el or '.ac.in' in el:
+        score += 30
+
+    # Official prefixes
+    if el.startswith(OFFICIAL_PREFIXES):
+        score += 20
+
+    # Common providers
+    if any(p in el for p in COMMON_PROVIDERS):
+        score += 10
+
+    # Domain matches college name patterns
+    if any(w in el for w in INSTITUTION_WORDS):
+        score += 5
+
+    # Penalize personal names
+    if any(x in el for x in PERSONAL_WORDS):
+        score -= 20
+
+    return score
+
+
+def clean_phone(phone: str) -> str:
+    """Indian mobile (10 digits, 6-9) or landline with STD (11 digits, 0...), else "" """
+    digits = re.sub(r'\D', '', phone)
+
+    if digits.startswith('91') and len(digits) == 12:
+        digits = digits[2:]
+
+    # 10-digit mobile (6-9)
+    if len(digits) == 10 and digits[0] in '6789':
+        return digits
+
+    # 11-digit landline
+    if len(digits) == 11 and digits[0] == '0':
+        return digits
+
+    return ""
+
+
+def is_valid_phone(raw: str) -> bool:
+    digits = re.sub(r"\D", "", raw)
+
+    # Reject dates like 14072025 or 20250714
+    if re.match(r"^(19|20)\d{6}$", digits):
+        return False
+
+    # Indian mobile or landline (with STD)
+    if len(digits) not in (10, 11):
+        return False
+
+    # Reject obvious junk
+    if digits.startswith("000"):
+        return False
+    if digits == digits[0] * len(digits):
+        return False
+
+    return True
+
+
+class Contacts:
+    """Contacts found in one document, in document order"""
+
+    __slots__ = ("emails", "phones")
+
+    def __init__(self):
+        # valid email -> score
+        self.emails = {}
+        # phone digits -> True when it passes clean_phone
+        self.phones = {}
+
+    def best_email(self, default: str = NOT_MENTIONED) -> str:
+        if not self.emails:
+            return default
+        # highest score wins, ties go to the lexically largest like the old sort
+        score, email = max((s, e) for e, s in self.emails.items())
+        return email if score >= MIN_EMAIL_SCORE else default
+
+    def best_phone(self, default: str = NOT_MENTIONED) -> str:
+        for digits, clean in self.phones.items():
+            if clean:
+                return digits
+        return default
+
+    def is_confident(self) -> bool:
+        return (
+            any(score >= CONFIDENT_EMAIL_SCORE for score in self.emails.values())
+            and any(self.phones.values())
+        )
+
+    def all_emails(self) -> list:
+        return list(self.emails)
+
+    def all_phones(self) -> list:
+        return list(self.phones)
+
+
+def priority_windows(html: str) -> list:
+    """(start, end) slices of html likely to hold the contact block, best first"""
+    size = len(html)
+    if size <= PRIORITY_WINDOW_CHARS:
+        return []
+
+    # A slice starting inside <script>/<style> would scan the JS/CSS as text
+    spans = hidden_spans(html)
+    span_starts = [start for start, _ in spans]
+
+    def visible(pos: int) -> int:
+        """pos, or the end of the hidden block it falls in"""
+        i = bisect_right(span_starts, pos) - 1
+        return spans[i][1] if i >= 0 and pos < spans[i][1] else pos
+
+    marks = []
+    for marker in PRIORITY_MARKERS:
+        pos = html.find(marker)
+        while pos != -1:
+            # "footer" inside a script or comment is not a footer
+            if visible(pos) == pos:
+                marks.append(pos)
+            pos = html.find(marker, pos + len(marker))
+
+    tail = html.find("<", size - PRIORITY_WINDOW_CHARS)
+    tail = visible(tail if tail != -1 else size - PRIORITY_WINDOW_CHARS)
+    windows = [(tail, size)] if tail < size else []
+
+    for mark in sorted(marks, reverse=True):
+        start = visible(max(html.rfind("<", 0, mark + 1), 0))
+        end = min(start + PRIORITY_WINDOW_CHARS, size)
+        # skip markers already covered by a chosen window
+        if any(s <= start < e for s, e in windows):
+            continue
+        windows.append((start, end))
+        if len(windows) > MAX_PRIORITY_WINDOWS:
+            break
+
+    return windows
+
+
+class ContactExtractor:
+    """Single-pass email + phone scanner shared by the extractor and scraper"""
+
+    def __init__(self, pattern: re.Pattern = CONTACT_PATTERN):
+        self.pattern = pattern
+
+    def _scan(self, contacts: Contacts, text: str, pos: int = 0, stop: int = None) -> int:
+        """Record matches starting in text[pos:stop], returns the end of the last one"""
+        emails = contacts.emails
+        phones = contacts.phones
+        last_end = pos
+
+        for match in self.pattern.finditer(text, pos):
+            if stop is not None and match.start() >= stop:
+                break
+            last_end = match.end()
+
+            domain = match.group("domain")
+            if domain is not None:
+                at = match.start()
+                start = at
+                floor = max(0, at - MAX_LOCAL_PART)
+                while start > floor and text[start - 1] in LOCAL_PART_CHARS:
+                    start -= 1
+                if start == at:
+                    continue
+                email = text[start:at] + "@" + domain
+                if email not in emails and is_valid_email(email):
+                    emails[email] = score_email(email)
+                continue
+
+            raw = match.group("phone")
+            cleaned = clean_phone(raw)
+            if cleaned:
+                phones.setdefault(cleaned, True)
+            elif is_valid_phone(raw):
+                phones.setdefault(re.sub(r"\D", "", raw), False)
+
+        return last_end
+
+    def feed(self, contacts: Contacts, text: str) -> Contacts:
+        self._scan(contacts, text)
+        return contacts
+
+    def feed_chunks(self, contacts: Contacts, chunks, done=None) -> Contacts:
+        """Scan text arriving in chunks, stopping early once done(contacts) is True"""
+        buf = ""
+        pos = 0
+        for chunk in chunks:
+            buf += chunk
+            cutoff = len(buf) - SCAN_OVERLAP
+            if cutoff <= pos:
+                continue
+
+            last_end = self._scan(contacts, buf, pos, cutoff)
+            keep = max(0, cutoff - SCAN_CONTEXT)
+            buf = buf[keep:]
+            pos = max(cutoff, last_end) - keep
+
+            if done is not None and done(contacts):
+                return contacts
+
+        self._scan(contacts, buf, pos)
+        return contacts
+
+    def extract(self, text: str) -> Contacts:
+        return self.feed(Contacts(), text or "")
+
+    def extract_html(self, html: str, early_stop: bool = False) -> Contacts:
+        """Contacts in the page's visible text and mailto:/tel: links"""
+        html = html or ""
+        contacts = Contacts()
+        if not early_stop:
+            return self.feed_chunks(contacts, iter_text_chunks(html))
+
+        for start, end in priority_windows(html):
+            self.feed_chunks(contacts, iter_text_chunks(html[start:end]), Contacts.is_confident)
+            if contacts.is_confident():
+                return contacts
+
+        return self.feed_chunks(contacts, iter_text_chunks(html), Contacts.is_confident)
+
+
+CONTACT_EXTRACTOR = ContactExtractor()
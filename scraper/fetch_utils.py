@@ -0,0 +1,76 @@
+import asyncio
+import os
+
+import aiohttp
+
+from scraper.scrape_utils import (
+    DEFAULT_HEADERS, MAX_PAGE_BYTES, CONNECT_TIMEOUT, READ_TIMEOUT, CHUNK_SIZE,
+    decode_body, is_text_content,
+)
+
+# Global cap on in-flight page downloads and cap per (host, port)
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "200"))
+FETCH_PER_HOST = int(os.getenv("FETCH_PER_HOST", "4"))
+
+
+class AsyncFetcher:
+    """Shared aiohttp session, the connector pool enforces the global and per-host limits"""
+
+    def __init__(self, concurrency: int = FETCH_CONCURRENCY,
+                 per_host: int = FETCH_PER_HOST, max_bytes: int = MAX_PAGE_BYTES):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.max_bytes = max_bytes
+        self._session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.per_host,
+            ttl_dns_cache=300,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            # No total timeout - time spent queued for a pool slot must not count
+            timeout=aiohttp.ClientTimeout(
+                total=None, sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+        self._session = None
+
+    async def fetch(self, url: str) -> str:
+        """Page text like scrape_html: "" for non-text responses, cut at max_bytes"""
+        async with self._session.get(url) as res:
+            if not is_text_content(res.headers.get("Content-Type", "")):
+                return ""
+
+            body = bytearray()
+            async for chunk in res.content.iter_chunked(CHUNK_SIZE):
+                body += chunk
+                if len(body) >= self.max_bytes:
+                    del body[self.max_bytes:]
+                    break
+
+            return decode_body(bytes(body), res.charset)
+
+
+def fetch_all(urls: list, **kwargs) -> dict:
+    """Blocking helper - fetch every URL concurrently, {url: html or None}"""
+
+    async def run():
+        async with AsyncFetcher(**kwargs) as fetcher:
+            pages = await asyncio.gather(
+                *(fetcher.fetch(url) for url in urls),
+                return_exceptions=True
+            )
+        return {
+            url: None if isinstance(page, BaseException) else page
+            for url, page in zip(urls, pages)
+        }
+
+    return asyncio.run(run())
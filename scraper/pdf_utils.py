@@ -0,0 +1,76 @@
+import io
+import logging
+import os
+from concurrent.futures import TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore
+
+from pdfminer.high_level import extract_text
+from pdfminer.psparser import PSException
+
+from process_pool import SpawnPool
+
+logger = logging.getLogger(__name__)
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Brochures put contacts on the first pages, the rest is not parsed
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "5"))
+# Give up on a document after this long (some PDFs make pdfminer crawl)
+PDF_PARSE_TIMEOUT = int(os.getenv("PDF_PARSE_TIMEOUT", "30"))
+# Parse jobs running or waiting; callers block beyond this so queued PDF
+# bytes stay bounded
+PDF_QUEUE_LIMIT = int(os.getenv("PDF_QUEUE_LIMIT", str(PDF_WORKERS * 2)))
+# Longest a caller waits for a free slot before skipping the document
+PDF_QUEUE_TIMEOUT = int(os.getenv("PDF_QUEUE_TIMEOUT", str(PDF_PARSE_TIMEOUT)))
+# Recycle pool processes, pdfminer is not shy with memory
+PDF_TASKS_PER_CHILD = 50
+
+
+# Runs in the pool processes
+def _pdf_text(data: bytes, max_pages: int) -> str:
+    try:
+        return extract_text(io.BytesIO(data), maxpages=max_pages)
+    except (PSException, ValueError, KeyError, TypeError, AssertionError):
+        # malformed, encrypted or cut off at the size cap
+        return ""
+
+
+class PdfPool(SpawnPool):
+    """Process pool for pdfminer text extraction"""
+
+    def __init__(self, workers: int = PDF_WORKERS, queue_limit: int = PDF_QUEUE_LIMIT):
+        super().__init__(workers, max_tasks_per_child=PDF_TASKS_PER_CHILD)
+        self._slots = BoundedSemaphore(queue_limit)
+
+    def extract_text(self, data: bytes, max_pages: int = PDF_MAX_PAGES,
+                     timeout: float = PDF_PARSE_TIMEOUT) -> str:
+        if not self._slots.acquire(timeout=PDF_QUEUE_TIMEOUT):
+            logger.warning("No free PDF parse slot after %ss, skipping", PDF_QUEUE_TIMEOUT)
+            return ""
+        try:
+            executor = self.executor()
+            future = executor.submit(_pdf_text, data, max_pages)
+        except BrokenProcessPool:
+            # a worker died (or the pool was recycled) since executor() returned it
+            self._slots.release()
+            self.recycle(executor)
+            return ""
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            # pdfminer cannot be interrupted, free the process and its slot
+            logger.warning("PDF parse timed out after %ss", timeout)
+            self.recycle(executor)
+            return ""
+        except BrokenProcessPool:
+            # recycled under this document, or a worker crashed
+            self.recycle(executor)
+            return ""
+
+
+PDF_POOL = PdfPool()
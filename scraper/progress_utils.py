@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between two progress writes to Mongo
+PROGRESS_FLUSH_INTERVAL = float(os.getenv("PROGRESS_FLUSH_INTERVAL", "2"))
+# Threads doing the periodic writes, so a job's event loop never waits on Mongo
+PROGRESS_WRITE_THREADS = 2
+# Without events for this long, re-read the job (it may run in another process)
+SSE_POLL_INTERVAL = 3
+
+TERMINAL_STATUSES = {"completed", "done", "incomplete", "failed", "cancelled", "not_found"}
+
+
+# ----------------------------
+# IN-PROCESS JOB EVENTS
+# ----------------------------
+def _put_latest(queue: asyncio.Queue, snapshot: dict):
+    # Keep only the newest snapshot, a slow client just skips the ones in between
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(snapshot)
+
+
+class JobEvents:
+    """Pushes job snapshots from worker threads to async subscribers"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._subscribers = {}
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Call from the event loop that will read the queue"""
+        queue = asyncio.Queue(maxsize=1)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(entry)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        with self._lock:
+            entries = self._subscribers.get(job_id, [])
+            entries[:] = [e for e in entries if e[1] is not queue]
+            if not entries:
+                self._subscribers.pop(job_id, None)
+
+    def publish(self, job_id: str, snapshot: dict):
+        with self._lock:
+            entries = list(self._subscribers.get(job_id, ()))
+        if not entries:
+            return
+
+        snapshot = json.loads(json.dumps(snapshot, default=str))
+        for loop, queue in entries:
+            try:
+                loop.call_soon_threadsafe(_put_latest, queue, snapshot)
+            except RuntimeError:
+                # Subscriber's loop already closed
+                pass
+
+
+JOB_EVENTS = JobEvents()
+
+
+def format_event(snapshot: dict) -> str:
+    return f"data: {json.dumps(snapshot, default=str)}\n\n"
+
+
+async def sse_stream(job_id: str, get_snapshot):
+    """Server-Sent Events for one job: current state, then every change until a final status"""
+    queue = JOB_EVENTS.subscribe(job_id)
+    try:
+        snapshot = await asyncio.to_thread(get_snapshot, job_id)
+        yield format_event(snapshot)
+
+        while snapshot.get("status") not in TERMINAL_STATUSES:
+            try:
+                snapshot = await asyncio.wait_for(queue.get(), timeout=SSE_POLL_INTERVAL)
+                yield format_event(snapshot)
+            except asyncio.TimeoutError:
+                latest = await asyncio.to_thread(get_snapshot, job_id)
+                if latest != snapshot:
+                    snapshot = latest
+                    yield format_event(snapshot)
+                else:
+                    yield ": keep-alive\n\n"
+    finally:
+        JOB_EVENTS.unsubscribe(job_id, queue)
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # nginx would otherwise buffer the stream
+}
+
+
+# ----------------------------
+# COALESCED PROGRESS WRITES
+# ----------------------------
+PROGRESS_WRITES = ThreadPoolExecutor(max_workers=PROGRESS_WRITE_THREADS,
+                                     thread_name_prefix="progress-write")
+
+
+class ProgressWriter:
+    """Merges progress updates and writes them at most once per interval, on PROGRESS_WRITES"""
+
+    def __init__(self, write, interval: float = PROGRESS_FLUSH_INTERVAL):
+        self._write = write
+        self.interval = interval
+        self._lock = Lock()
+        # held from taking the pending fields until they are written, keeps writes in order
+        self._write_lock = Lock()
+        self._pending = {}
+        self._scheduled = False
+        self._last_write = 0.0
+
+    def update(self, **fields):
+        with self._lock:
+            self._pending.update(fields)
+            if self._scheduled or time.monotonic() - self._last_write < self.interval:
+                return
+            self._scheduled = True
+            self._last_write = time.monotonic()
+        PROGRESS_WRITES.submit(self._write_scheduled)
+
+    def _write_pending(self):
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._scheduled = False
+            if pending:
+                self._write(pending)
+
+    def _write_scheduled(self):
+        try:
+            self._write_pending()
+        except Exception:
+            logger.exception("Progress write failed")
+
+    def flush(self):
+        """Write what is pending now, on the caller's thread"""
+        with self._lock:
+            self._last_write = time.monotonic()
+        self._write_pending()
@@ -1,69 +1,219 @@
-from fastapi import APIRouter
-from database import colleges_collection, contacts_collection, progress_collection
-from scraper.scrape_utils import scrape_html, scrape_pdf, extract_emails, extract_phones
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import os
+from database import (
+    colleges_collection, contacts_collection, progress_collection, pagination_collection
+)
+from scraper.scrape_utils import scrape_html, scrape_pdf
+from scraper.contact_utils import CONTACT_EXTRACTOR
+from scraper.progress_utils import ProgressWriter, sse_stream, SSE_HEADERS
+from jobs.store import JOB_STORE, FINISHED
+from jobs.worker import JobCancelled, JobReporter, register_handler, submit_job, get_job_status
 
 router = APIRouter(prefix="/scrape", tags=["Scraping"])
 
+DUPLICATE_KEY_ERROR = 11000
+
+# Shared by every scrape job, bounds total concurrent college scrapes
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", "8"))
+SCRAPE_POOL = ThreadPoolExecutor(max_workers=SCRAPE_WORKERS)
+
+
+def upsert_contacts(college_id, source: str, emails: list, phones: list) -> dict:
+    """Bulk upsert on the unique email/phone keys, existing contacts are left untouched"""
+    ops = [
+        UpdateOne(
+            {"email": email},
+            {"$setOnInsert": {"college_id": college_id, "phone": None, "source": source}},
+            upsert=True
+        )
+        for email in emails
+    ] + [
+        UpdateOne(
+            {"phone": phone},
+            {"$setOnInsert": {"college_id": college_id, "email": None, "source": source}},
+            upsert=True
+        )
+        for phone in phones
+    ]
+
+    counts = {"inserted": 0, "existing": 0, "errors": 0}
+    if not ops:
+        return counts
+
+    try:
+        result = contacts_collection.bulk_write(ops, ordered=False)
+        details = result.bulk_api_result
+    except BulkWriteError as e:
+        details = e.details
+        for error in details.get("writeErrors", []):
+            # Lost an upsert race, someone else inserted the same contact
+            if error.get("code") == DUPLICATE_KEY_ERROR:
+                counts["existing"] += 1
+            else:
+                counts["errors"] += 1
+
+    counts["inserted"] += details.get("nUpserted", 0)
+    counts["existing"] += details.get("nMatched", 0)
+    return counts
 
-@router.post("/run")
-def run_scraping(state: str, district: str):
-    colleges = list(colleges_collection.find({
-        "state": state,
-        "district": district
-    }))
-
-    total = len(colleges)
-    completed = 0
-
-    # reset progress
-    progress_collection.delete_many({})
-    progress_collection.insert_one({
-        "total": total,
-        "completed": 0,
-        "status": "running"
-    })
-
-    for college in colleges:
-        website = college.get("website")
-        if not website:
-            completed += 1
-            progress_collection.update_one({}, {"$set": {"completed": completed}})
-            continue
 
+def scrape_college(job_id: str, college: dict) -> dict:
+    """Scrape one college and checkpoint it, returns contact write counts"""
+    counts = {"inserted": 0, "existing": 0, "errors": 0}
+    website = college.get("website")
+
+    if website:
         if website.lower().endswith(".pdf"):
-            text = scrape_pdf(website)
+            contacts = CONTACT_EXTRACTOR.extract(scrape_pdf(website))
         else:
-            text = scrape_html(website)
-
-        emails = extract_emails(text)
-        phones = extract_phones(text)
-
-        for email in emails:
-            if not contacts_collection.find_one({"email": email}):
-                contacts_collection.insert_one({
-                    "college_id": college["_id"],
-                    "email": email,
-                    "phone": None,
-                    "source": website
-                })
-
-        for phone in phones:
-            if not contacts_collection.find_one({"phone": phone}):
-                contacts_collection.insert_one({
-                    "college_id": college["_id"],
-                    "email": None,
-                    "phone": phone,
-                    "source": website
-                })
+            contacts = CONTACT_EXTRACTOR.extract_html(scrape_html(website))
+
+        counts = upsert_contacts(college["_id"], website, contacts.all_emails(), contacts.all_phones())
 
         colleges_collection.update_one(
             {"_id": college["_id"]},
             {"$set": {"completed": True}}
         )
 
-        completed += 1
-        progress_collection.update_one({}, {"$set": {"completed": completed}})
+    # Checkpoint - a resumed job skips this college
+    pagination_collection.update_one(
+        {"kind": "checkpoint", "job_id": job_id, "college_id": college["_id"]},
+        {"$set": {"status": "done", "contacts": counts, "finished_at": datetime.utcnow()}},
+        upsert=True
+    )
+    return counts
+
+
+def scrape_worker(job: JobReporter, state: str, district: str):
+    """Worker - scrapes a district on the shared pool, skipping checkpointed colleges"""
+    job_id = job.job_id
+    force = job.get("force", False)
+    contacts = {"inserted": 0, "existing": 0, "errors": 0}
+
+    try:
+        colleges = list(colleges_collection.find(
+            {"state": state, "district": district},
+            {"website": 1, "completed": 1}
+        ))
+
+        done_ids = {
+            doc["college_id"] for doc in pagination_collection.find(
+                {"kind": "checkpoint", "job_id": job_id, "status": "done"},
+                {"college_id": 1}
+            )
+        }
+        todo = [
+            c for c in colleges
+            if c["_id"] not in done_ids and (force or not c.get("completed"))
+        ]
+
+        completed = len(colleges) - len(todo)
+        failed = 0
+        job.update(status="running", total=len(colleges), completed=completed,
+                   skipped=completed, failed=0, contacts=contacts)
+
+        # reset progress
+        progress_collection.delete_many({})
+        progress_collection.insert_one({
+            "job_id": job_id,
+            "total": len(colleges),
+            "completed": completed,
+            "status": "running"
+        })
+        progress = ProgressWriter(
+            lambda fields: progress_collection.update_one({}, {"$set": fields})
+        )
+
+        futures = [SCRAPE_POOL.submit(scrape_college, job_id, c) for c in todo]
+
+        try:
+            for future in as_completed(futures):
+                try:
+                    counts = future.result()
+                    contacts = {key: contacts[key] + counts[key] for key in contacts}
+                except Exception:
+                    # No checkpoint written, resuming retries it
+                    failed += 1
+
+                completed += 1
+                job.update(completed=completed, failed=failed, contacts=contacts)
+                progress.update(completed=completed)
+        except JobCancelled:
+            # colleges not started yet are left for a resume
+            for future in futures:
+                future.cancel()
+            progress.update(status="cancelled")
+            progress.flush()
+            raise
+
+        progress.update(status="done", contacts=contacts)
+        progress.flush()
+        job.update(status="done" if not failed else "incomplete")
+
+    except JobCancelled:
+        raise
+    except Exception as e:
+        job.update(status="failed", error=str(e))
+
+
+register_handler("scrape", scrape_worker)
+
+
+@router.post("/run")
+def run_scraping(state: str, district: str, force: bool = False):
+    """Start a background scrape of a district, resuming an unfinished one"""
+    params = {"state": state, "district": district}
+    latest = JOB_STORE.find_latest("scrape", params)
+
+    if latest and latest.get("status") != "done":
+        if latest["queue_state"] == FINISHED:
+            JOB_STORE.update(latest["_id"], {"force": force, "status": "queued"})
+            JOB_STORE.requeue(latest["_id"])
+        return {"job_id": latest["_id"], "resumed": True}
+
+    job_id = submit_job(
+        "scrape", params,
+        status="queued",
+        force=force,
+        total=0,
+        completed=0,
+        skipped=0,
+        failed=0,
+        contacts={"inserted": 0, "existing": 0, "errors": 0}
+    )
+    return {"job_id": job_id, "resumed": False}
+
+
+@router.post("/resume/{job_id}")
+def resume_scraping(job_id: str):
+    """Restart a failed or incomplete job, checkpointed colleges are skipped"""
+    job = JOB_STORE.get(job_id)
+    if not job or job["kind"] != "scrape":
+        raise HTTPException(404, "Job not found")
+
+    if job["queue_state"] == FINISHED:
+        JOB_STORE.update(job_id, {"status": "queued"})
+        JOB_STORE.requeue(job_id)
+
+    return {"job_id": job_id, "resumed": True}
+
+
+@router.get("/status/{job_id}")
+def get_scrape_status(job_id: str):
+    """Status"""
+    return get_job_status(job_id)
 
-    progress_collection.update_one({}, {"$set": {"status": "done"}})
 
-    return {"message": "Scraping completed"}
+@router.get("/events/{job_id}")
+def stream_scrape_status(job_id: str):
+    """Server-Sent Events stream of the job status, replaces polling /status"""
+    return StreamingResponse(
+        sse_stream(job_id, get_scrape_status),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
@@ -1,55 +1,85 @@
-import re
+import codecs
+import os
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
+from scraper.pdf_utils import PDF_POOL
 
-def scrape_html(url: str) -> str:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-    }
-    res = requests.get(url, headers=headers, timeout=15)
-    return res.text
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+}
 
+# Stop reading a page after this many (decompressed) bytes
+MAX_PAGE_BYTES = int(os.getenv("SCRAPE_MAX_BYTES", str(1024 * 1024)))
+# Brochure PDFs are bigger than pages but still capped
+MAX_PDF_BYTES = int(os.getenv("SCRAPE_MAX_PDF_BYTES", str(10 * 1024 * 1024)))
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+CHUNK_SIZE = 16 * 1024
 
-def extract_emails(html: str):
-    return list(set(re.findall(
-        r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
-        html
-    )))
+# Anything else (images, pdf, zip, video...) is skipped before download
+TEXT_CONTENT_TYPES = ("text/", "application/xhtml", "application/xml", "application/json")
 
 
-def is_valid_phone(raw: str) -> bool:
-    digits = re.sub(r"\D", "", raw)
+def make_session(pool_size: int = 50) -> requests.Session:
+    """Keep-alive session shared by all scraping threads"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # requests advertises br automatically when the brotli package is installed
+    session.headers.update(DEFAULT_HEADERS)
+    return session
 
-    # Reject dates like 14072025 or 20250714
-    if re.match(r"^(19|20)\d{6}$", digits):
-        return False
 
-    # Indian mobile or landline (with STD)
-    if len(digits) not in (10, 11):
-        return False
+SESSION = make_session()
 
-    # Reject obvious junk
-    if digits.startswith("000"):
-        return False
-    if digits == digits[0] * len(digits):
-        return False
 
-    return True
+def is_text_content(content_type: str) -> bool:
+    """Missing content type is allowed, servers often omit it"""
+    content_type = content_type.lower()
+    return not content_type or content_type.startswith(TEXT_CONTENT_TYPES)
 
 
-def extract_phones(html: str):
-    soup = BeautifulSoup(html, "html.parser")
-    text = soup.get_text(" ")
+def read_capped(res: requests.Response, max_bytes: int) -> bytes:
+    """Read a streamed body, stopping at max_bytes"""
+    body = bytearray()
+    for chunk in res.iter_content(chunk_size=CHUNK_SIZE):
+        body += chunk
+        if len(body) >= max_bytes:
+            del body[max_bytes:]
+            break
+    return bytes(body)
 
-    candidates = re.findall(
-        r"\+91[\s\-]?\d{10}|0\d{2,4}[\s\-]?\d{6,8}|\d{10}",
-        text
-    )
 
-    valid = []
-    for c in candidates:
-        if is_valid_phone(c):
-            valid.append(re.sub(r"\D", "", c))
+def decode_body(body: bytes, charset: str | None) -> str:
+    """Decode with the server's charset, utf-8 if it is missing or unknown"""
+    try:
+        encoding = codecs.lookup(charset).name if charset else "utf-8"
+    except LookupError:
+        encoding = "utf-8"
+    return body.decode(encoding, errors="replace")
 
-    return list(set(valid))
+
+def scrape_html(url: str, max_bytes: int = MAX_PAGE_BYTES) -> str:
+    with SESSION.get(url, stream=True, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)) as res:
+        if not is_text_content(res.headers.get("Content-Type", "")):
+            return ""
+        body = read_capped(res, max_bytes)
+        encoding = res.encoding
+
+    return decode_body(body, encoding)
+
+
+def scrape_pdf(url: str, max_bytes: int = MAX_PDF_BYTES) -> str:
+    """Text of the first pages of a PDF, "" if it is not one"""
+    with SESSION.get(url, stream=True, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)) as res:
+        # servers answer missing brochures with an HTML page
+        if res.headers.get("Content-Type", "").lower().startswith("text/"):
+            return ""
+        body = read_capped(res, max_bytes)
+
+    if not body.startswith(b"%PDF"):
+        return ""
+
+    return PDF_POOL.extract_text(body)
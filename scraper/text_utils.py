@@ -0,0 +1,125 @@
+import logging
+import os
+import re
+from html import unescape
+from typing import Iterator
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # optional backend
+    lxml = None
+
+logger = logging.getLogger(__name__)
+
+# "tokenizer" (default, no dependencies) or "lxml"
+HTML_TEXT_BACKEND = os.getenv("HTML_TEXT_BACKEND", "tokenizer")
+
+# Text is handed to the contact scanner in pieces of about this size
+TEXT_CHUNK_CHARS = 32 * 1024
+
+SKIPPED_TAGS = ("script", "style", "noscript", "template")
+
+# Walks the document once: comments and skipped elements are consumed whole
+# (to the end of input if never closed), every other tag is a separator.
+TOKEN_PATTERN = re.compile(
+    r"<!--.*?(?:-->|\Z)"
+    r"|<(" + "|".join(SKIPPED_TAGS) + r")\b[^>]*>.*?(?:</\1\s*>|\Z)"
+    r"|<[^>]*>",
+    re.DOTALL | re.IGNORECASE
+)
+# Just the parts TOKEN_PATTERN drops whole: comments and skipped elements
+HIDDEN_PATTERN = re.compile(
+    r"<!--.*?(?:-->|\Z)"
+    r"|<(" + "|".join(SKIPPED_TAGS) + r")\b[^>]*>.*?(?:</\1\s*>|\Z)",
+    re.DOTALL | re.IGNORECASE
+)
+# mailto:/tel: targets are often not repeated in the visible text
+CONTACT_HREF = re.compile(r"""href\s*=\s*["']?\s*((?:mailto|tel):[^"'\s>?]+)""", re.IGNORECASE)
+
+
+def hidden_spans(html: str) -> list:
+    """(start, end) of every comment and script/style/noscript/template element"""
+    return [match.span() for match in HIDDEN_PATTERN.finditer(html)]
+
+
+def contact_href(value: str) -> str:
+    return value.split(":", 1)[1]
+
+
+def tokenizer_parts(html: str) -> Iterator[str]:
+    """Visible text pieces plus mailto:/tel: targets, via a single regex tokenizer"""
+    pos = 0
+
+    for match in TOKEN_PATTERN.finditer(html):
+        start = match.start()
+        if start > pos:
+            yield html[pos:start]
+        pos = match.end()
+
+        tag = match.group(0)
+        if match.group(1) is None and ("mailto:" in tag or "tel:" in tag):
+            for value in CONTACT_HREF.findall(tag):
+                yield contact_href(value)
+
+    if pos < len(html):
+        yield html[pos:]
+
+
+def lxml_parts(html: str) -> Iterator[str]:
+    """Same output contract as tokenizer_parts, built on lxml's C parser"""
+    try:
+        tree = lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        yield from tokenizer_parts(html)
+        return
+
+    etree.strip_elements(tree, *SKIPPED_TAGS, etree.Comment, with_tail=False)
+
+    yield from tree.itertext()
+    for href in tree.xpath("//a/@href"):
+        href = href.strip()
+        if href[:7].lower() == "mailto:" or href[:4].lower() == "tel:":
+            yield contact_href(href.split("?", 1)[0])
+
+
+TEXT_BACKENDS = {
+    "tokenizer": tokenizer_parts,
+    "lxml": lxml_parts,
+}
+
+
+def get_text_backend(name: str = HTML_TEXT_BACKEND):
+    if name == "lxml" and lxml is None:
+        logger.warning("lxml is not installed, using the tokenizer text backend")
+        name = "tokenizer"
+    if name not in TEXT_BACKENDS:
+        raise ValueError(f"Unknown HTML text backend: {name}")
+    return TEXT_BACKENDS[name]
+
+
+text_parts = get_text_backend()
+
+
+def decode(part: str) -> str:
+    return unescape(part) if "&" in part else part
+
+
+def html_to_text(html: str, parts=None) -> str:
+    return " ".join(map(decode, (parts or text_parts)(html)))
+
+
+def iter_text_chunks(html: str, chunk_chars: int = TEXT_CHUNK_CHARS, parts=None) -> Iterator[str]:
+    """html_to_text in pieces of about chunk_chars, cut only between text parts"""
+    buf = []
+    size = 0
+    for part in (parts or text_parts)(html):
+        part = decode(part)
+        buf.append(part)
+        size += len(part) + 1
+        if size >= chunk_chars:
+            yield " ".join(buf) + " "
+            buf = []
+            size = 0
+    if buf:
+        yield " ".join(buf)
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from database import users_collection
 from auth.auth_utils import get_current_user, hash_password
+from auth.user_cache import USER_CACHE
+from auth.hash_pool import HashPoolBusy
 from pydantic import BaseModel
 from bson import ObjectId
 
@@ -38,11 +40,17 @@ def add_user(user: UserCreate, current_user=Depends(get_current_user)):
     if users_collection.find_one({"username": user.username}):
         raise HTTPException(status_code=400, detail="User already exists")
 
+    try:
+        hashed = hash_password(user.password)
+    except HashPoolBusy:
+        raise HTTPException(status_code=429, detail="Server busy, try again shortly")
+
     users_collection.insert_one({
         "username": user.username,
-        "password": hash_password(user.password),
+        "password": hashed,
         "role": user.role
     })
+    USER_CACHE.invalidate(user.username)
 
     return {"message": "User created successfully"}
 
@@ -57,9 +65,18 @@ def delete_user(username: str, current_user=Depends(get_current_user)):
         raise HTTPException(status_code=400, detail="Admin cannot delete self")
 
     result = users_collection.delete_one({"username": username})
+    USER_CACHE.invalidate(username)
 
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
 
     return {"message": "User deleted successfully"}
 
+
+
+@router.get("/cache-stats")
+def user_cache_stats(current_user=Depends(get_current_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return USER_CACHE.stats()